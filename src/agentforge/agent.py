@@ -4,16 +4,170 @@ Main AI agent with autonomous reasoning and tool use
 """
 
 import os
+import re
 import json
-from typing import Generator, Dict, Any, Optional
-from openai import OpenAI
+import asyncio
+import hashlib
+import functools
+from typing import AsyncGenerator, Generator, Dict, Any, List, Optional, Tuple
+import httpx
+from openai import APIError, AsyncOpenAI, DefaultAsyncHttpxClient, DefaultHttpxClient, OpenAI
 from dotenv import load_dotenv
 
 from .tools import ToolRegistry, ToolExecutor
 from .memory import ConversationMemory
+from .cache import LRUCache, SemanticCache
+from .runtime import iterate_sync
+
+try:
+    import orjson
+    
+    _json_loads = orjson.loads
+    
+    def _json_dumps_sorted(obj: Any) -> bytes:
+        return orjson.dumps(obj, option=orjson.OPT_SORT_KEYS)
+except ImportError:
+    _json_loads = json.loads
+    
+    def _json_dumps_sorted(obj: Any) -> bytes:
+        return json.dumps(obj, sort_keys=True).encode()
 
 load_dotenv()
 
+# Kept byte-identical across turns so provider-side prompt caching can hit
+_SYSTEM_PROMPT = """You are AgentForge, an advanced AI assistant with access to multiple tools.
+
+Your capabilities:
+🔍 Web Search - Search for current information and news
+🧮 Calculator - Perform mathematical calculations  
+🌤️ Weather - Check weather for any city
+📝 Notes - Save and retrieve notes/tasks
+⏰ Time - Get current date and time
+
+Guidelines:
+1. Use tools ONCE per request - do not retry failed tools
+2. If a tool fails, explain the issue to the user
+3. Think step-by-step and use appropriate tools
+4. Provide clear, accurate responses based on tool results
+5. If you cannot complete a task, explain why
+
+Important: Call each tool only once. If it fails, inform the user instead of retrying."""
+
+
+_SUMMARY_PROMPT = (
+    "Summarize the following conversation in a short paragraph. Keep facts the user "
+    "shared, decisions made, and any open tasks; omit pleasantries."
+)
+# Per-message cap on text sent to the summarizer
+_SUMMARY_INPUT_CHARS = 2000
+
+
+_GROQ_BASE_URL = "https://api.groq.com/openai/v1"
+
+
+@functools.lru_cache(maxsize=8)
+def _make_clients(api_key: str, base_url: Optional[str] = None) -> Tuple[OpenAI, AsyncOpenAI]:
+    """Create sync and async clients once per credential
+    
+    Agents re-created with the same key (e.g. on every Streamlit re-initialize)
+    share the clients and their warm connection pools. The async client is
+    safe to share because all async work runs on the single runtime loop.
+    """
+    limits = httpx.Limits(max_connections=100, max_keepalive_connections=20)
+    
+    client = OpenAI(
+        api_key=api_key,
+        base_url=base_url,
+        http_client=DefaultHttpxClient(limits=limits)
+    )
+    aclient = AsyncOpenAI(
+        api_key=api_key,
+        base_url=base_url,
+        http_client=DefaultAsyncHttpxClient(limits=limits)
+    )
+    return client, aclient
+
+
+# Yielded by _stream_completion before a retry: deltas received so far are void
+_STREAM_RESTART = object()
+
+
+_TOOL_FAIL_RE = re.compile(r"tool_use_failed|failed_generation")
+
+
+def _is_tool_use_failure(error: APIError) -> bool:
+    """Whether the provider rejected a malformed tool call (Groq reports these as 400s)"""
+    return error.code == "tool_use_failed" or bool(_TOOL_FAIL_RE.search(error.message or ""))
+
+
+# Upper bound on messages sent per LLM call, system prompt included
+_MAX_CONTEXT_MESSAGES = 24
+
+
+def _trim_messages(
+    messages: List[Dict[str, Any]],
+    pinned: Dict[str, Any],
+    max_messages: int
+) -> List[Dict[str, Any]]:
+    """Sliding window over the context
+    
+    Keeps the system prompt, the pinned message (the current user question)
+    and the newest messages. An assistant message with tool_calls is never
+    separated from its tool responses.
+    """
+    if len(messages) <= max_messages:
+        return messages
+    
+    head = messages[:1] if messages[0]["role"] == "system" else []
+    
+    # Leave room for the system prompt and the pinned message
+    cut = len(messages) - (max_messages - len(head) - 1)
+    while cut > len(head) and messages[cut]["role"] == "tool":
+        cut -= 1
+    
+    tail = messages[cut:]
+    if not any(message is pinned for message in tail):
+        head = head + [pinned]
+    
+    return head + tail
+
+
+def _parse_arguments(arguments: str) -> Dict[str, Any]:
+    """Parse tool call arguments, treating malformed or empty JSON as no arguments"""
+    try:
+        return _json_loads(arguments)
+    except ValueError:
+        return {}
+
+
+def _tool_key(name: str, arguments: str) -> int:
+    """Compact dedup key for a tool call; stores a 64-bit hash instead of the full string"""
+    return hash(f"{name}:{arguments}")
+
+
+def _merge_tool_call_deltas(parts: Dict[int, Dict[str, Any]], deltas: List[Any]) -> None:
+    """Accumulate streamed tool call fragments, which arrive piecewise by index
+    
+    Parts are built directly in the API wire format so they can be sent back
+    in the assistant message without another copy.
+    """
+    for delta in deltas:
+        part = parts.get(delta.index)
+        if part is None:
+            part = parts[delta.index] = {
+                "id": "",
+                "type": "function",
+                "function": {"name": "", "arguments": ""}
+            }
+        
+        if delta.id:
+            part["id"] = delta.id
+        if delta.function:
+            if delta.function.name:
+                part["function"]["name"] += delta.function.name
+            if delta.function.arguments:
+                part["function"]["arguments"] += delta.function.arguments
+
 
 class AgentForge:
     """Autonomous AI Agent with tool use and memory"""
@@ -24,24 +178,35 @@ class AgentForge:
         session_id: str = "default",
         db_path: str = "database/agentforge.db",
         max_iterations: int = 5,
-        temperature: float = 0.7
+        temperature: float = 0.7,
+        cache_responses: bool = True,
+        max_completion_tokens: int = 2000,
+        service_tier: Optional[str] = None
     ):
         """Initialize AgentForge"""
         self.model = model
         self.session_id = session_id
         self.max_iterations = max_iterations
         self.temperature = temperature
+        self.cache_responses = cache_responses
+        self.max_completion_tokens = max_completion_tokens
+        self.service_tier = service_tier
+        
+        # Response caches for repeated turns (exact match, then semantic)
+        self._exact_cache = LRUCache(maxsize=256)
+        self._sem_cache = SemanticCache(threshold=0.95)
         
         # Initialize components
-        self.memory = ConversationMemory(db_path)
+        self.memory = ConversationMemory(db_path, summarizer=self._summarize_history)
         self.tool_executor = ToolExecutor(db_path)
         self.tool_registry = ToolRegistry()
         
         # Setup OpenAI client
         self._setup_client()
         
-        # Get tool definitions
+        # Get tool definitions once; the frozen tuple is what gets sent per request
         self.tools = self.tool_registry.get_tool_definitions()
+        self._tools_frozen = tuple(self.tools)
     
     def _setup_client(self):
         """Setup OpenAI or Groq client"""
@@ -51,14 +216,11 @@ class AgentForge:
         openai_key = os.getenv("OPENAI_API_KEY")
         
         if groq_key:
-            self.client = OpenAI(
-                api_key=groq_key,
-                base_url="https://api.groq.com/openai/v1"
-            )
+            self.client, self.aclient = _make_clients(groq_key, _GROQ_BASE_URL)
             self.provider = "Groq"
         
         elif openai_key:
-            self.client = OpenAI(api_key=openai_key)
+            self.client, self.aclient = _make_clients(openai_key)
             self.provider = "OpenAI"
         
         else:
@@ -66,124 +228,229 @@ class AgentForge:
                 "No API key found. Please set OPENAI_API_KEY or GROQ_API_KEY in .env file"
             )
     
+    def _summarize_history(self, messages: List[Dict[str, Any]]) -> str:
+        """Condense older turns into a short summary when memory compacts a session"""
+        transcript = "\n".join(
+            f"{msg['role']}: {msg['content'][:_SUMMARY_INPUT_CHARS]}" for msg in messages
+        )
+        
+        response = self.client.chat.completions.create(
+            model=self.model,
+            messages=[
+                {"role": "system", "content": _SUMMARY_PROMPT},
+                {"role": "user", "content": transcript}
+            ],
+            temperature=0.2,
+            max_completion_tokens=500
+        )
+        return response.choices[0].message.content or ""
+    
     def get_system_prompt(self) -> str:
         """Get the system prompt that defines agent behavior"""
-        return """You are AgentForge, an advanced AI assistant with access to multiple tools.
-
-Your capabilities:
-🔍 Web Search - Search for current information and news
-🧮 Calculator - Perform mathematical calculations  
-🌤️ Weather - Check weather for any city
-📝 Notes - Save and retrieve notes/tasks
-⏰ Time - Get current date and time
-
-Guidelines:
-1. Use tools ONCE per request - do not retry failed tools
-2. If a tool fails, explain the issue to the user
-3. Think step-by-step and use appropriate tools
-4. Provide clear, accurate responses based on tool results
-5. If you cannot complete a task, explain why
-
-Important: Call each tool only once. If it fails, inform the user instead of retrying."""
+        return _SYSTEM_PROMPT
+    
+    async def _stream_completion(
+        self,
+        messages: List[Dict[str, Any]],
+        usage: Dict[str, int],
+        use_tools: bool = True,
+        tool_choice: str = "auto"
+    ) -> AsyncGenerator[Any, None]:
+        """Stream completion deltas, retrying without tools if tool calling fails
+        
+        Token usage reported at the end of the stream is added to usage. A
+        retry is announced by yielding _STREAM_RESTART first, since the failed
+        attempt may already have produced deltas.
+        """
+        request = {
+            "model": self.model,
+            "messages": messages,
+            "temperature": self.temperature,
+            "max_completion_tokens": self.max_completion_tokens,
+            "stream": True,
+            "stream_options": {"include_usage": True}
+        }
+        if use_tools:
+            request["tools"] = self._tools_frozen
+            request["tool_choice"] = tool_choice
+        
+        extra_body = {}
+        if self.service_tier:
+            extra_body["service_tier"] = self.service_tier
+        # messages is only ever appended to within a turn, so the prefix stays
+        # stable; the cache key routes a session's requests to the same cache
+        if self.provider == "OpenAI":
+            extra_body["prompt_cache_key"] = self.session_id
+        if extra_body:
+            request["extra_body"] = extra_body
+        
+        try:
+            stream = await self.aclient.chat.completions.create(**request)
+            async for chunk in stream:
+                if chunk.usage:
+                    usage["total_tokens"] += chunk.usage.total_tokens
+                if chunk.choices:
+                    yield chunk.choices[0].delta
+        except APIError as api_error:
+            # If tool calling fails, respond without tools
+            if use_tools and _is_tool_use_failure(api_error):
+                yield _STREAM_RESTART
+                async for delta in self._stream_completion(messages, usage, use_tools=False):
+                    yield delta
+            else:
+                raise api_error
+    
+    def _cache_keys(self, user_message: str) -> Tuple[str, str]:
+        """Build the exact-match key and the semantic namespace for a turn
+        
+        Earlier turns are left out on purpose: once a question is answered the
+        answer is part of the history, so a key over it never matches a re-ask.
+        """
+        def digest(payload: Any) -> str:
+            return hashlib.blake2b(_json_dumps_sorted(payload), digest_size=16).hexdigest()
+        
+        namespace = digest([self.model, self.temperature, self.get_system_prompt()])
+        exact_key = digest([namespace, user_message])
+        return exact_key, namespace
     
     def chat(self, user_message: str) -> Generator[Dict[str, Any], None, None]:
         """Process a user message and generate response with tool use"""
+        yield from iterate_sync(self.achat(user_message))
+    
+    async def achat(self, user_message: str) -> AsyncGenerator[Dict[str, Any], None]:
+        """Async version of chat - tool calls from one turn run concurrently"""
+        
+        # Messages from this turn are buffered and written in one transaction
+        pending_writes = [("user", user_message, None, 0)]
+        
+        try:
+            async for event in self._run_turn(user_message, pending_writes):
+                yield event
+        finally:
+            # May flush the writer queue and query SQLite; keep that off the
+            # loop shared by all sessions
+            await asyncio.to_thread(self.memory.add_messages_bulk, self.session_id, pending_writes)
+    
+    async def _run_turn(
+        self,
+        user_message: str,
+        pending_writes: List[Tuple[str, str, Optional[List[str]], int]]
+    ) -> AsyncGenerator[Dict[str, Any], None]:
+        """Run the reasoning loop for one user message"""
         
-        # Save user message to memory
-        self.memory.add_message(self.session_id, "user", user_message)
+        # Serve repeated turns from cache without calling the LLM
+        if self.cache_responses:
+            cache_key, cache_namespace = self._cache_keys(user_message)
+            cached = self._exact_cache.get(cache_key)
+            if cached is None and self._sem_cache.enabled:
+                # Embedding is CPU-bound; keep it off the loop shared by all sessions
+                cached = await asyncio.to_thread(self._sem_cache.get, user_message, cache_namespace)
+            
+            if cached is not None:
+                pending_writes.append(("assistant", cached, None, 0))
+                yield {
+                    'type': 'response',
+                    'content': cached
+                }
+                return
         
-        # Build message history
-        messages = self.memory.format_for_llm(
+        # Build message history; the new user message is not stored yet.
+        # Loading the window flushes pending writes and reads SQLite.
+        messages = await asyncio.to_thread(
+            self.memory.format_for_llm,
             self.session_id,
-            limit=8,
+            limit=7,
             system_prompt=self.get_system_prompt()
         )
+        user_entry = {
+            "role": "user",
+            "content": user_message
+        }
+        messages.append(user_entry)
         
         # Track tool usage and prevent duplicate calls
         tools_used = []
-        tools_called = set()  # Track which tools have been called
+        tools_called = set()  # Hashes of tool calls made so far
+        usage = {"total_tokens": 0}
         iteration = 0
         
-        while iteration < self.max_iterations:
+        # max_iterations tool rounds, plus one tool-free pass for the answer if
+        # every round ended in tool calls
+        while iteration <= self.max_iterations:
             iteration += 1
             
+            # Tools stay in the request on the extra pass to keep the cached
+            # prompt prefix intact; tool_choice alone forbids calling them
+            tool_choice = "none" if iteration > self.max_iterations else "auto"
+            
             try:
-                # Call LLM
-                try:
-                    response = self.client.chat.completions.create(
-                        model=self.model,
-                        messages=messages,
-                        tools=self.tools,
-                        tool_choice="auto",
-                        temperature=self.temperature,
-                        max_tokens=2000
-                    )
-                except Exception as api_error:
-                    error_str = str(api_error)
-                    # If tool calling fails, respond without tools
-                    if "tool_use_failed" in error_str or "failed_generation" in error_str:
-                        response = self.client.chat.completions.create(
-                            model=self.model,
-                            messages=messages,
-                            temperature=self.temperature,
-                            max_tokens=2000
-                        )
-                    else:
-                        raise api_error
+                # Call LLM and stream the reply
+                content_parts = []
+                tool_call_parts: Dict[int, Dict[str, Any]] = {}
                 
-                assistant_message = response.choices[0].message
+                async for delta in self._stream_completion(messages, usage, tool_choice=tool_choice):
+                    if delta is _STREAM_RESTART:
+                        # Drop the partial text and tool calls of the failed attempt
+                        content_parts.clear()
+                        tool_call_parts.clear()
+                        yield {
+                            'type': 'reset',
+                            'content': None
+                        }
+                        continue
+                    
+                    if delta.content:
+                        content_parts.append(delta.content)
+                        yield {
+                            'type': 'token',
+                            'content': delta.content
+                        }
+                    
+                    if delta.tool_calls:
+                        _merge_tool_call_deltas(tool_call_parts, delta.tool_calls)
+                
+                content = "".join(content_parts)
+                tool_calls = [tool_call_parts[index] for index in sorted(tool_call_parts)]
                 
                 # Check if agent wants to use tools
-                if hasattr(assistant_message, 'tool_calls') and assistant_message.tool_calls:
+                if tool_calls:
                     
-                    # Check for duplicate tool calls
-                    skip_tools = False
-                    for tc in assistant_message.tool_calls:
-                        tool_key = f"{tc.function.name}:{tc.function.arguments}"
-                        if tool_key in tools_called:
-                            # Tool already called, force response
-                            skip_tools = True
-                            break
+                    if iteration > self.max_iterations:
+                        # The provider ignored tool_choice="none"; end the loop
+                        # and fall back to the summary of what was gathered
+                        continue
+                    
+                    # Drop calls already made this turn, but keep the new ones
+                    new_calls = []
+                    for tc in tool_calls:
+                        tool_key = _tool_key(tc['function']['name'], tc['function']['arguments'])
+                        if tool_key not in tools_called:
+                            tools_called.add(tool_key)
+                            new_calls.append(tc)
                     
-                    if skip_tools:
-                        # Add a message to force final response
+                    if not new_calls:
+                        # Every call was a repeat - add a message to force final response
                         messages.append({
                             "role": "user",
                             "content": "Please provide your final answer based on the previous tool results. Do not call tools again."
                         })
                         continue
                     
-                    # Prepare assistant message for conversation history
+                    # Prepare assistant message for conversation history; only
+                    # calls that will be answered with a tool message are included
                     messages.append({
                         "role": "assistant",
-                        "content": assistant_message.content or "",
-                        "tool_calls": [
-                            {
-                                "id": tc.id,
-                                "type": "function",
-                                "function": {
-                                    "name": tc.function.name,
-                                    "arguments": tc.function.arguments
-                                }
-                            }
-                            for tc in assistant_message.tool_calls
-                        ]
+                        "content": content,
+                        "tool_calls": new_calls
                     })
                     
-                    # Execute each tool call
-                    for tool_call in assistant_message.tool_calls:
-                        function_name = tool_call.function.name
-                        
-                        try:
-                            function_args = json.loads(tool_call.function.arguments)
-                        except json.JSONDecodeError:
-                            function_args = {}
-                        
-                        # Mark this tool as called
-                        tool_key = f"{function_name}:{json.dumps(function_args)}"
-                        tools_called.add(tool_key)
-                        
-                        # Yield tool call notification
+                    # Parse arguments and notify before starting any tool
+                    parsed_calls = [
+                        (tool_call, tool_call['function']['name'], _parse_arguments(tool_call['function']['arguments']))
+                        for tool_call in new_calls
+                    ]
+                    
+                    for _, function_name, function_args in parsed_calls:
                         yield {
                             'type': 'tool_call',
                             'content': {
@@ -191,12 +458,17 @@ Important: Call each tool only once. If it fails, inform the user instead of ret
                                 'args': function_args
                             }
                         }
-                        
-                        # Execute the tool
-                        tool_result = self.tool_executor.execute(
-                            function_name, 
-                            function_args
-                        )
+                    
+                    # Execute all tool calls concurrently; failures come back as values
+                    results = await self.tool_executor.aexecute_many(
+                        [(name, args) for _, name, args in parsed_calls]
+                    )
+                    
+                    for (tool_call, function_name, function_args), tool_result in zip(parsed_calls, results):
+                        yield {
+                            'type': 'tool_result',
+                            'content': tool_result
+                        }
                         
                         # Track tool usage
                         tools_used.append({
@@ -205,36 +477,41 @@ Important: Call each tool only once. If it fails, inform the user instead of ret
                             'result': tool_result
                         })
                         
-                        # Yield tool result
-                        yield {
-                            'type': 'tool_result',
-                            'content': tool_result
-                        }
-                        
                         # Add tool result to messages
                         messages.append({
                             "role": "tool",
                             "content": tool_result,
-                            "tool_call_id": tool_call.id
+                            "tool_call_id": tool_call['id']
                         })
                     
+                    # Bound the context sent on the next iteration
+                    messages = _trim_messages(messages, user_entry, _MAX_CONTEXT_MESSAGES)
+                    
                     # Continue loop to let agent process tool results
                     continue
                 
                 else:
                     # No more tool calls - agent has final response
-                    final_response = assistant_message.content
+                    final_response = content
                     
                     if not final_response:
                         final_response = "I apologize, but I couldn't generate a proper response. Please try rephrasing your question."
                     
+                    # Only tool-free answers are cached; tool results go stale
+                    if self.cache_responses and not tools_used and content:
+                        self._exact_cache.put(cache_key, final_response)
+                        if self._sem_cache.enabled:
+                            await asyncio.to_thread(
+                                self._sem_cache.put, user_message, final_response, cache_namespace
+                            )
+                    
                     # Save assistant response to memory
-                    self.memory.add_message(
-                        self.session_id,
+                    pending_writes.append((
                         "assistant",
                         final_response,
-                        tool_calls=[t['name'] for t in tools_used] if tools_used else None
-                    )
+                        [t['name'] for t in tools_used] if tools_used else None,
+                        usage["total_tokens"]
+                    ))
                     
                     # Yield final response
                     yield {
@@ -248,11 +525,7 @@ Important: Call each tool only once. If it fails, inform the user instead of ret
                 error_msg = f"Error: {str(e)}"
                 
                 # Save error to memory
-                self.memory.add_message(
-                    self.session_id,
-                    "assistant",
-                    f"[Error occurred: {error_msg}]"
-                )
+                pending_writes.append(("assistant", f"[Error occurred: {error_msg}]", None, usage["total_tokens"]))
                 
                 yield {
                     'type': 'error',
@@ -260,21 +533,21 @@ Important: Call each tool only once. If it fails, inform the user instead of ret
                 }
                 break
         
-        # Check if max iterations reached
-        if iteration >= self.max_iterations:
-            # Try to give a helpful response with what we have
+        else:
+            # Max iterations reached without a final response (the loop never
+            # hit break), so try to give a helpful response with what we have
             if tools_used:
-                summary = "I've gathered the following information:\n\n"
-                for tool in tools_used:
-                    summary += f"- Used {tool['name']}: {tool['result'][:200]}...\n\n"
-                summary += "\nHowever, I reached the maximum number of steps. Please ask a more specific question."
-                
-                self.memory.add_message(
-                    self.session_id,
-                    "assistant",
-                    summary
+                summary = (
+                    "I've gathered the following information:\n\n"
+                    + "".join(
+                        f"- Used {tool['name']}: {tool['result'][:200]}...\n\n"
+                        for tool in tools_used
+                    )
+                    + "\nHowever, I reached the maximum number of steps. Please ask a more specific question."
                 )
                 
+                pending_writes.append(("assistant", summary, None, usage["total_tokens"]))
+                
                 yield {
                     'type': 'response',
                     'content': summary
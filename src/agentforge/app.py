@@ -6,12 +6,15 @@ Interactive UI for the AI agent
 import streamlit as st
 import sys
 import os
+import queue
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
 # Add parent directory to path for imports
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
 from agentforge import AgentForge
+from agentforge.streaming import STREAM_DONE, drain_agent
 from datetime import datetime
 import time
 
@@ -23,8 +26,9 @@ st.set_page_config(
     initial_sidebar_state="expanded"
 )
 
-# Custom CSS
-st.markdown("""
+# Custom CSS. Streamlit drops elements that are not re-emitted on a rerun,
+# so this is sent every run rather than once behind a session flag.
+_CSS = """
 <style>
     /* Main theme */
     .stApp {
@@ -97,13 +101,39 @@ st.markdown("""
         border: none;
     }
 </style>
-""", unsafe_allow_html=True)
+"""
+
+# HTML templates for repeated blocks
+_FEATURE_CARD_TEMPLATE = """
+<div class='metric-card'>
+    <h2 style='color: {color}; font-size: 3em; margin: 0;'>{icon}</h2>
+    <h3>{title}</h3>
+    <p style='color: #666;'>{text}</p>
+</div>
+"""
+
+_TOOL_CALL_TEMPLATE = """
+<div class="tool-call">
+    <b>🔧 Using Tool:</b> {name}<br>
+    <b>📋 Arguments:</b> <code>{args}</code>
+</div>
+"""
+
+_FEATURES = [
+    ("#667eea", "🔍", "Information Retrieval", "Search web, check weather, get current time and more"),
+    ("#764ba2", "🧠", "Persistent Memory", "Remembers conversations and saves notes for later"),
+    ("#0ea5e9", "⚡", "Autonomous Actions", "Multi-step reasoning and intelligent tool chaining")
+]
+
+st.markdown(_CSS, unsafe_allow_html=True)
 
 # Initialize session state
 def init_session_state():
     """Initialize all session state variables"""
     if 'agent' not in st.session_state:
         st.session_state.agent = None
+    if 'executor' not in st.session_state:
+        st.session_state.executor = ThreadPoolExecutor(max_workers=1)
     if 'messages' not in st.session_state:
         st.session_state.messages = []
     if 'session_id' not in st.session_state:
@@ -273,34 +303,12 @@ if st.session_state.agent is None:
     """, unsafe_allow_html=True)
     
     # Features
-    col1, col2, col3 = st.columns(3)
-    
-    with col1:
-        st.markdown("""
-        <div class='metric-card'>
-            <h2 style='color: #667eea; font-size: 3em; margin: 0;'>🔍</h2>
-            <h3>Information Retrieval</h3>
-            <p style='color: #666;'>Search web, check weather, get current time and more</p>
-        </div>
-        """, unsafe_allow_html=True)
-    
-    with col2:
-        st.markdown("""
-        <div class='metric-card'>
-            <h2 style='color: #764ba2; font-size: 3em; margin: 0;'>🧠</h2>
-            <h3>Persistent Memory</h3>
-            <p style='color: #666;'>Remembers conversations and saves notes for later</p>
-        </div>
-        """, unsafe_allow_html=True)
-    
-    with col3:
-        st.markdown("""
-        <div class='metric-card'>
-            <h2 style='color: #0ea5e9; font-size: 3em; margin: 0;'>⚡</h2>
-            <h3>Autonomous Actions</h3>
-            <p style='color: #666;'>Multi-step reasoning and intelligent tool chaining</p>
-        </div>
-        """, unsafe_allow_html=True)
+    for col, (color, icon, title, text) in zip(st.columns(3), _FEATURES):
+        with col:
+            st.markdown(
+                _FEATURE_CARD_TEMPLATE.format(color=color, icon=icon, title=title, text=text),
+                unsafe_allow_html=True
+            )
     
     st.markdown("---")
     
@@ -356,12 +364,10 @@ else:
         
         elif msg['type'] == 'tool_call':
             with st.chat_message("assistant", avatar="🔧"):
-                st.markdown(f"""
-                <div class="tool-call">
-                    <b>🔧 Using Tool:</b> {msg['content']['name']}<br>
-                    <b>📋 Arguments:</b> <code>{msg['content']['args']}</code>
-                </div>
-                """, unsafe_allow_html=True)
+                st.markdown(
+                    _TOOL_CALL_TEMPLATE.format(name=msg['content']['name'], args=msg['content']['args']),
+                    unsafe_allow_html=True
+                )
         
         elif msg['type'] == 'tool_result':
             with st.chat_message("assistant", avatar="✅"):
@@ -388,10 +394,61 @@ else:
             thinking_placeholder = st.empty()
             thinking_placeholder.markdown("🤔 <span class='agent-thinking'>Thinking...</span>", unsafe_allow_html=True)
             
+            # Streamed tokens render into a placeholder that is finalized
+            # when a tool call or the final response arrives
+            response_placeholder = None
+            streamed_text = ""
+            
             try:
-                for step in st.session_state.agent.chat(prompt):
+                # The agent runs on a worker thread so this script thread
+                # stays free to update the UI while waiting on the LLM
+                steps = queue.Queue()
+                st.session_state.executor.submit(drain_agent, st.session_state.agent, prompt, steps)
+                started = time.time()
+                waiting = True
+                shown_seconds = 0
+                
+                while True:
+                    try:
+                        step = steps.get(timeout=0.05)
+                    except queue.Empty:
+                        elapsed = int(time.time() - started)
+                        if waiting and elapsed != shown_seconds:
+                            shown_seconds = elapsed
+                            thinking_placeholder.markdown(
+                                f"🤔 <span class='agent-thinking'>Thinking... {elapsed}s</span>",
+                                unsafe_allow_html=True
+                            )
+                        continue
+                    
+                    if step is STREAM_DONE:
+                        break
+                    if isinstance(step, Exception):
+                        raise step
+                    
+                    waiting = False
                     thinking_placeholder.empty()
                     
+                    if step['type'] == 'token':
+                        if response_placeholder is None:
+                            response_placeholder = st.empty()
+                        streamed_text += step['content']
+                        response_placeholder.markdown(streamed_text + "▌")
+                        continue
+                    
+                    if step['type'] == 'reset':
+                        # The LLM call is being retried; discard the text streamed so far
+                        if response_placeholder is not None:
+                            response_placeholder.empty()
+                            response_placeholder = None
+                        streamed_text = ""
+                        continue
+                    
+                    if response_placeholder is not None and step['type'] != 'response':
+                        response_placeholder.markdown(streamed_text)
+                        response_placeholder = None
+                        streamed_text = ""
+                    
                     if step['type'] == 'tool_call':
                         # Update stats based on tool
                         st.session_state.stats['tools_used'] += 1
@@ -407,12 +464,10 @@ else:
                             st.session_state.stats['weather_checks'] += 1
                         
                         # Display tool call
-                        st.markdown(f"""
-                        <div class="tool-call">
-                            <b>🔧 Using Tool:</b> {tool_name}<br>
-                            <b>📋 Arguments:</b> <code>{step['content']['args']}</code>
-                        </div>
-                        """, unsafe_allow_html=True)
+                        st.markdown(
+                            _TOOL_CALL_TEMPLATE.format(name=tool_name, args=step['content']['args']),
+                            unsafe_allow_html=True
+                        )
                         
                         st.session_state.messages.append({
                             'type': 'tool_call',
@@ -430,7 +485,10 @@ else:
                         })
                     
                     elif step['type'] == 'response':
-                        st.markdown(step['content'])
+                        if response_placeholder is not None:
+                            response_placeholder.markdown(step['content'])
+                        else:
+                            st.markdown(step['content'])
                         
                         st.session_state.messages.append({
                             'type': 'assistant',
@@ -0,0 +1,188 @@
+"""
+AgentForge Cache Module
+Exact-match and semantic caches for repeated requests
+"""
+
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+try:
+    from fastembed import TextEmbedding
+except ImportError:
+    TextEmbedding = None
+
+# Embedding models by name, loaded once and shared by every SemanticCache
+_embedders: Dict[str, Any] = {}
+_embedders_lock = threading.Lock()
+
+
+def _get_embedder(model_name: str) -> Any:
+    """Return the process-wide embedding model, loading it on first use"""
+    with _embedders_lock:
+        embedder = _embedders.get(model_name)
+        if embedder is None:
+            embedder = _embedders[model_name] = TextEmbedding(model_name=model_name)
+    return embedder
+
+
+class LRUCache:
+    """Exact-match cache with least-recently-used eviction"""
+    
+    def __init__(self, maxsize: int = 256):
+        self.maxsize = maxsize
+        self._data: "OrderedDict[Any, Any]" = OrderedDict()
+    
+    def get(self, key: Any) -> Optional[Any]:
+        """Return the cached value for key, or None on a miss"""
+        if key not in self._data:
+            return None
+        
+        self._data.move_to_end(key)
+        return self._data[key]
+    
+    def put(self, key: Any, value: Any) -> None:
+        """Store a value, evicting the least recently used entry when full"""
+        self._data[key] = value
+        self._data.move_to_end(key)
+        
+        if len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+    
+    def clear(self) -> None:
+        """Remove all entries"""
+        self._data.clear()
+    
+    def __len__(self) -> int:
+        return len(self._data)
+
+
+class SemanticCache:
+    """Cache keyed by text meaning, using embeddings and random-projection LSH
+    
+    Requires the optional numpy and fastembed packages; without them every
+    lookup is a miss and nothing is stored. Embedding is CPU-bound and the
+    first call loads the model, so async callers should run get/put in a
+    worker thread. Callers sharing a cache behind a lock can embed() first
+    and hold the lock only for lookup()/store().
+    """
+    
+    def __init__(
+        self,
+        threshold: float = 0.95,
+        maxsize: int = 256,
+        num_bits: int = 8,
+        num_tables: int = 4,
+        model_name: str = "BAAI/bge-small-en-v1.5"
+    ):
+        self.threshold = threshold
+        self.maxsize = maxsize
+        self.num_bits = num_bits
+        self.num_tables = num_tables
+        self.model_name = model_name
+        self.enabled = np is not None and TextEmbedding is not None
+        
+        self._planes = None
+        self._next_id = 0
+        # entry id -> (namespace, embedding, bucket keys, value)
+        self._entries: "OrderedDict[int, Tuple[str, Any, Tuple[int, ...], Any]]" = OrderedDict()
+        self._tables: List[Dict[Tuple[str, int], Set[int]]] = [{} for _ in range(num_tables)]
+    
+    def embed(self, text: str) -> Optional[Any]:
+        """Embed text as a unit vector, disabling the cache if the model is unavailable"""
+        if not self.enabled:
+            return None
+        
+        try:
+            embedder = _get_embedder(self.model_name)
+            vector = np.asarray(next(iter(embedder.embed([text]))), dtype=np.float32)
+        except Exception:
+            self.enabled = False
+            return None
+        
+        if self._planes is None:
+            rng = np.random.default_rng(0)
+            self._planes = rng.standard_normal(
+                (self.num_tables, self.num_bits, vector.shape[0])
+            ).astype(np.float32)
+        
+        norm = np.linalg.norm(vector)
+        return vector / norm if norm else vector
+    
+    def _bucket_keys(self, vector: Any) -> Tuple[int, ...]:
+        """Hash a vector into one bucket per LSH table"""
+        bits = (self._planes @ vector) > 0
+        weights = 1 << np.arange(self.num_bits)
+        return tuple(int(key) for key in bits @ weights)
+    
+    def get(self, text: str, namespace: str = "") -> Optional[Any]:
+        """Return the value stored for the most similar text above the threshold"""
+        if not self._entries:
+            return None
+        
+        vector = self.embed(text)
+        if vector is None:
+            return None
+        return self.lookup(vector, namespace)
+    
+    def lookup(self, vector: Any, namespace: str = "") -> Optional[Any]:
+        """Return the value stored for the most similar embedding above the threshold"""
+        candidates: Set[int] = set()
+        for table, key in zip(self._tables, self._bucket_keys(vector)):
+            candidates.update(table.get((namespace, key), ()))
+        
+        best_id, best_score = None, self.threshold
+        for entry_id in candidates:
+            score = float(self._entries[entry_id][1] @ vector)
+            if score >= best_score:
+                best_id, best_score = entry_id, score
+        
+        if best_id is None:
+            return None
+        
+        self._entries.move_to_end(best_id)
+        return self._entries[best_id][3]
+    
+    def put(self, text: str, value: Any, namespace: str = "") -> None:
+        """Store a value under the embedding of text"""
+        vector = self.embed(text)
+        if vector is not None:
+            self.store(vector, value, namespace)
+    
+    def store(self, vector: Any, value: Any, namespace: str = "") -> None:
+        """Store a value under an embedding returned by embed()"""
+        keys = self._bucket_keys(vector)
+        entry_id = self._next_id
+        self._next_id += 1
+        
+        self._entries[entry_id] = (namespace, vector, keys, value)
+        for table, key in zip(self._tables, keys):
+            table.setdefault((namespace, key), set()).add(entry_id)
+        
+        if len(self._entries) > self.maxsize:
+            self._evict_oldest()
+    
+    def _evict_oldest(self) -> None:
+        """Drop the least recently used entry from the store and all tables"""
+        entry_id, (namespace, _, keys, _) = self._entries.popitem(last=False)
+        
+        for table, key in zip(self._tables, keys):
+            bucket = table.get((namespace, key))
+            if bucket is not None:
+                bucket.discard(entry_id)
+                if not bucket:
+                    del table[(namespace, key)]
+    
+    def clear(self) -> None:
+        """Remove all entries"""
+        self._entries.clear()
+        for table in self._tables:
+            table.clear()
+    
+    def __len__(self) -> int:
+        return len(self._entries)
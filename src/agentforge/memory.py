@@ -3,66 +3,347 @@ AgentForge Memory Module
 Manages conversation history and persistent storage
 """
 
+import functools
 import json
+import logging
 import sqlite3
-import os
-from datetime import datetime
-from typing import List, Dict, Optional, Any
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future
+from datetime import datetime, timezone
+from typing import Callable, List, Dict, Optional, Any, Tuple
+
+from .cache import LRUCache
+from .storage import BatchWriter, apply_pragmas, connect
+
+_log = logging.getLogger(__name__)
+
+try:
+    import orjson
+    
+    # Encodes straight to bytes, which SQLite stores without a str round trip
+    _json_dumps = orjson.dumps
+    _json_loads = orjson.loads
+except ImportError:
+    _json_dumps = json.dumps
+    _json_loads = json.loads
+
+# Roles are stored as small integers
+_ROLE_TO_INT = {'system': 0, 'user': 1, 'assistant': 2, 'tool': 3, 'summary': 4}
+_INT_TO_ROLE = {value: role for role, value in _ROLE_TO_INT.items()}
+_SUMMARY = _ROLE_TO_INT['summary']
+
+
+def _now_us() -> int:
+    """Current time as integer UNIX epoch microseconds"""
+    return time.time_ns() // 1000
+
+
+def _format_timestamp(timestamp_us: int) -> str:
+    """Render epoch microseconds as the UTC 'YYYY-MM-DD HH:MM:SS' text used before"""
+    return datetime.fromtimestamp(timestamp_us // 1_000_000, timezone.utc).strftime('%Y-%m-%d %H:%M:%S')
+
+
+def _log_write_failure(session_id: str, count: int, future: Future):
+    """Log a queued write that failed with no caller waiting on it"""
+    error = future.exception()
+    if error is not None:
+        _log.error(
+            "Failed to store %d message(s) for session %s", count, session_id,
+            exc_info=error
+        )
 
 
 class ConversationMemory:
     """Manages conversation history with SQLite backend"""
     
-    def __init__(self, db_path: str = 'database/agentforge.db'):
+    # Minimum number of recent messages kept in RAM per active session
+    HOT_WINDOW = 16
+    # Most queued writes committed together in one transaction
+    WRITE_BATCH = 500
+    # Most get_conversation_history results kept in RAM
+    HISTORY_CACHE_SIZE = 128
+    # Compact a session each time its message count crosses a multiple of this
+    COMPACT_EVERY = 100
+    # Messages older than this are deleted when their session compacts, and
+    # from all sessions at most once per PURGE_INTERVAL seconds
+    HISTORY_MAX_AGE_DAYS = 180
+    PURGE_INTERVAL = 24 * 3600
+    
+    _SQL_INSERT_MESSAGE = '''INSERT INTO conversations 
+                         (session_id, role, content, tool_calls, tool_results, tokens_used, timestamp) 
+                         VALUES (?, ?, ?, ?, ?, ?, ?)'''
+    
+    # Newest `limit` non-system messages for the in-memory window, oldest first
+    _SQL_WINDOW = '''SELECT role, content 
+                     FROM (
+                         SELECT id, role, content, timestamp 
+                         FROM conversations 
+                         WHERE session_id = ? AND role != 0  -- system
+                         ORDER BY timestamp DESC, id DESC 
+                         LIMIT ?
+                     ) 
+                     ORDER BY timestamp ASC, id ASC'''
+    
+    # Newest `limit` rows, returned oldest first
+    _SQL_HIST_WITH_SYS = '''SELECT role, content, tool_calls, tool_results, timestamp 
+                            FROM (
+                                SELECT id, role, content, tool_calls, tool_results, timestamp 
+                                FROM conversations 
+                                WHERE session_id = ? 
+                                ORDER BY timestamp DESC, id DESC 
+                                LIMIT ?
+                            ) 
+                            ORDER BY timestamp ASC, id ASC'''
+    
+    _SQL_HIST_NO_SYS = '''SELECT role, content, tool_calls, tool_results, timestamp 
+                          FROM (
+                              SELECT id, role, content, tool_calls, tool_results, timestamp 
+                              FROM conversations 
+                              WHERE session_id = ? AND role != 0  -- system
+                              ORDER BY timestamp DESC, id DESC 
+                              LIMIT ?
+                          ) 
+                          ORDER BY timestamp ASC, id ASC'''
+    
+    # Expired messages of every session; going through the sessions table lets
+    # idx_session_ts serve each session instead of scanning every message
+    _SQL_PURGE_ALL = '''DELETE FROM conversations 
+                        WHERE session_id IN (SELECT session_id FROM sessions) AND timestamp < ?'''
+    
+    # Everything but the newest `keep_last` non-system messages, oldest first
+    _SQL_COMPACTABLE = '''SELECT id, role, content, timestamp 
+                          FROM conversations 
+                          WHERE session_id = ? AND role != 0  -- system
+                            AND id NOT IN (
+                                SELECT id 
+                                FROM conversations 
+                                WHERE session_id = ? AND role != 0  -- system
+                                ORDER BY timestamp DESC, id DESC 
+                                LIMIT ?
+                            ) 
+                          ORDER BY timestamp ASC, id ASC'''
+    
+    def __init__(
+        self,
+        db_path: str = 'database/agentforge.db',
+        summarizer: Optional[Callable[[List[Dict[str, Any]]], str]] = None
+    ):
         self.db_path = db_path
+        # Condenses old messages during compaction; compaction is off without one
+        self.summarizer = summarizer
+        self._message_counts: Dict[str, int] = {}
+        self._compacting: set = set()
+        self._next_purge = 0.0
+        # Recent non-system messages per session, written through on every add
+        self._hot: Dict[str, deque] = {}
+        # History results tagged with the session version they were read at
+        self._hist_cache = LRUCache(maxsize=self.HISTORY_CACHE_SIZE)
+        self._versions: Dict[str, int] = {}
+        
+        # One long-lived connection, shared across threads under a lock
+        self._conn = connect(self.db_path)
+        self._lock = threading.Lock()
+        
         self._ensure_database()
+        
+        # A single writer thread drains queued inserts in batched transactions
+        self._writer = BatchWriter(
+            self._conn,
+            self._lock,
+            self._SQL_INSERT_MESSAGE,
+            name="agentforge-memory-writer",
+            max_batch=self.WRITE_BATCH
+        )
+    
+    def _remember(self, session_id: str, role: str, content: str):
+        """Append to the in-memory window if the session has been loaded"""
+        window = self._hot.get(session_id)
+        if window is not None and role != 'system':
+            window.append({"role": role, "content": content})
+    
+    def _load_window(self, session_id: str, size: int) -> deque:
+        """Hydrate a session's in-memory window from the newest messages"""
+        self.flush()
+        with self._lock:
+            cursor = self._conn.cursor()
+            window = deque(maxlen=size)
+            for role, content in cursor.execute(self._SQL_WINDOW, (session_id, size)):
+                # Compacted history reaches the LLM as system context
+                if role == _SUMMARY:
+                    window.append({
+                        "role": "system",
+                        "content": f"Summary of the earlier conversation: {content}"
+                    })
+                else:
+                    window.append({"role": _INT_TO_ROLE[role], "content": content})
+        
+        self._hot[session_id] = window
+        return window
+    
+    def _bump_version(self, session_id: str):
+        """Invalidate cached history for a session"""
+        self._versions[session_id] = self._versions.get(session_id, 0) + 1
+    
+    def _enqueue(self, session_id: str, rows: List[Tuple]) -> Future:
+        """Queue (role, content, tool_calls, tool_results, tokens_used, timestamp) rows for the writer"""
+        self._bump_version(session_id)
+        compact = self._count_messages(session_id, len(rows))
+        # Session counters are maintained by the conversations insert trigger
+        future = self._writer.submit([(session_id, *row) for row in rows])
+        
+        if compact:
+            threading.Thread(
+                target=self._compact_in_background,
+                args=(session_id,),
+                name="agentforge-memory-compactor",
+                daemon=True
+            ).start()
+        return future
+    
+    def _count_messages(self, session_id: str, added: int) -> bool:
+        """Track a session's message count; True when it crosses a COMPACT_EVERY boundary"""
+        if self.summarizer is None:
+            return False
+        
+        count = self._message_counts.get(session_id)
+        if count is None:
+            info = self.get_session_info(session_id)
+            count = info["message_count"] if info else 0
+        self._message_counts[session_id] = count + added
+        
+        return (count + added) // self.COMPACT_EVERY > count // self.COMPACT_EVERY
+    
+    def _compact_in_background(self, session_id: str):
+        """Run compact_session unless one is already running for the session"""
+        if session_id in self._compacting:
+            return
+        
+        self._compacting.add(session_id)
+        try:
+            self.compact_session(session_id)
+            self._purge_if_due()
+        finally:
+            self._compacting.discard(session_id)
+    
+    def _purge_if_due(self):
+        """Purge expired messages from all sessions at most once per PURGE_INTERVAL"""
+        now = time.monotonic()
+        if now < self._next_purge:
+            return
+        
+        self._next_purge = now + self.PURGE_INTERVAL
+        self.purge_expired()
+    
+    def flush(self):
+        """Block until every queued message has been committed"""
+        self._writer.flush()
     
     def _ensure_database(self):
         """Initialize database tables if they don't exist"""
-        os.makedirs(os.path.dirname(self.db_path), exist_ok=True)
-        
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
+        with self._lock, self._conn:
+            cursor = self._conn.cursor()
+            apply_pragmas(cursor)
+            
+            # Conversations table
+            cursor.execute('''
+                CREATE TABLE IF NOT EXISTS conversations (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    session_id TEXT NOT NULL,
+                    role INTEGER NOT NULL,
+                    content TEXT NOT NULL,
+                    tool_calls TEXT,
+                    tool_results TEXT,
+                    timestamp INTEGER NOT NULL DEFAULT (
+                        CAST(ROUND((julianday('now') - 2440587.5) * 86400000) AS INTEGER) * 1000
+                    ),
+                    tokens_used INTEGER DEFAULT 0
+                )
+            ''')
+            self._migrate_conversations(cursor)
+            
+            # Sessions table
+            cursor.execute('''
+                CREATE TABLE IF NOT EXISTS sessions (
+                    session_id TEXT PRIMARY KEY,
+                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                    last_active TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                    message_count INTEGER DEFAULT 0,
+                    total_tokens INTEGER DEFAULT 0,
+                    metadata TEXT
+                )
+            ''')
+            
+            # History reads walk this index backwards, which yields
+            # (timestamp DESC, id DESC) directly, so the LIMIT needs no sort;
+            # it also serves every session_id lookup
+            cursor.execute('''
+                CREATE INDEX IF NOT EXISTS idx_session_ts 
+                ON conversations(session_id, timestamp)
+            ''')
+            cursor.execute('DROP INDEX IF EXISTS idx_session_id')
+            cursor.execute('DROP INDEX IF EXISTS idx_timestamp')
+            
+            # Keep session counters in step with every inserted message
+            cursor.execute('''
+                CREATE TRIGGER IF NOT EXISTS trg_conversations_session
+                AFTER INSERT ON conversations
+                BEGIN
+                    INSERT INTO sessions (session_id, message_count, total_tokens) 
+                    VALUES (NEW.session_id, 1, NEW.tokens_used)
+                    ON CONFLICT(session_id) 
+                    DO UPDATE SET 
+                        last_active = CURRENT_TIMESTAMP,
+                        message_count = message_count + 1,
+                        total_tokens = total_tokens + excluded.total_tokens;
+                END
+            ''')
+
+    
+    def _migrate_conversations(self, cursor: sqlite3.Cursor):
+        """Convert a pre-existing TEXT role / TIMESTAMP conversations table in place"""
+        columns = {row[1]: row[2] for row in cursor.execute('PRAGMA table_info(conversations)')}
+        if columns.get('role', '').upper() == 'INTEGER':
+            return
         
-        # Conversations table
-        cursor.execute('''
-            CREATE TABLE IF NOT EXISTS conversations (
+        # Unknown roles fall back to assistant; timestamps were UTC CURRENT_TIMESTAMP text
+        cursor.executescript('''
+            BEGIN;
+            CREATE TABLE conversations_new (
                 id INTEGER PRIMARY KEY AUTOINCREMENT,
                 session_id TEXT NOT NULL,
-                role TEXT NOT NULL,
+                role INTEGER NOT NULL,
                 content TEXT NOT NULL,
                 tool_calls TEXT,
                 tool_results TEXT,
-                timestamp TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                timestamp INTEGER NOT NULL DEFAULT (
+                    CAST(ROUND((julianday('now') - 2440587.5) * 86400000) AS INTEGER) * 1000
+                ),
                 tokens_used INTEGER DEFAULT 0
-            )
-        ''')
-        
-        # Sessions table
-        cursor.execute('''
-            CREATE TABLE IF NOT EXISTS sessions (
-                session_id TEXT PRIMARY KEY,
-                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                last_active TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                message_count INTEGER DEFAULT 0,
-                total_tokens INTEGER DEFAULT 0,
-                metadata TEXT
-            )
-        ''')
-        
-        # Create indexes for better performance
-        cursor.execute('''
-            CREATE INDEX IF NOT EXISTS idx_session_id 
-            ON conversations(session_id)
-        ''')
-        
-        cursor.execute('''
-            CREATE INDEX IF NOT EXISTS idx_timestamp 
-            ON conversations(timestamp)
+            );
+            INSERT INTO conversations_new 
+                (id, session_id, role, content, tool_calls, tool_results, timestamp, tokens_used)
+            SELECT 
+                id, 
+                session_id, 
+                CASE role 
+                    WHEN 'system' THEN 0 WHEN 'user' THEN 1 WHEN 'assistant' THEN 2 
+                    WHEN 'tool' THEN 3 WHEN 'summary' THEN 4 ELSE 2 
+                END, 
+                content, 
+                tool_calls, 
+                tool_results, 
+                COALESCE(
+                    CAST(ROUND((julianday(timestamp) - 2440587.5) * 86400000) AS INTEGER) * 1000,
+                    CAST(ROUND((julianday('now') - 2440587.5) * 86400000) AS INTEGER) * 1000
+                ), 
+                tokens_used
+            FROM conversations;
+            DROP TABLE conversations;
+            ALTER TABLE conversations_new RENAME TO conversations;
+            COMMIT;
         ''')
-        
-        conn.commit()
-        conn.close()
     
     def add_message(
         self, 
@@ -74,87 +355,90 @@ class ConversationMemory:
         tokens_used: int = 0
     ) -> int:
         """Add a message to conversation history"""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-        
-        # Insert message
-        cursor.execute(
-            '''INSERT INTO conversations 
-               (session_id, role, content, tool_calls, tool_results, tokens_used) 
-               VALUES (?, ?, ?, ?, ?, ?)''',
-            (
-                session_id, 
-                role, 
-                content, 
-                json.dumps(tool_calls) if tool_calls else None,
-                json.dumps(tool_results) if tool_results else None,
-                tokens_used
-            )
-        )
+        future = self._enqueue(session_id, [(
+            _ROLE_TO_INT[role], 
+            content, 
+            _json_dumps(tool_calls) if tool_calls else None,
+            _json_dumps(tool_results) if tool_results else None,
+            tokens_used,
+            _now_us()
+        )])
         
-        message_id = cursor.lastrowid
-        
-        # Update or create session
-        cursor.execute(
-            '''INSERT INTO sessions (session_id, message_count, total_tokens) 
-               VALUES (?, 1, ?)
-               ON CONFLICT(session_id) 
-               DO UPDATE SET 
-                   last_active = CURRENT_TIMESTAMP,
-                   message_count = message_count + 1,
-                   total_tokens = total_tokens + ?''',
-            (session_id, tokens_used, tokens_used)
-        )
+        self._remember(session_id, role, content)
         
-        conn.commit()
-        conn.close()
+        # Wait for the writer so the caller gets the new row id
+        return future.result()[0]
+    
+    def add_messages_bulk(
+        self,
+        session_id: str,
+        messages: List[Tuple[str, str, Optional[List], int]]
+    ) -> None:
+        """Queue several (role, content, tool_calls, tokens_used) messages without waiting"""
+        if not messages:
+            return
         
-        return message_id
+        now = _now_us()
+        future = self._enqueue(session_id, [
+            (
+                _ROLE_TO_INT[role],
+                content,
+                _json_dumps(tool_calls) if tool_calls else None,
+                None,
+                tokens_used,
+                now
+            )
+            for role, content, tool_calls, tokens_used in messages
+        ])
+        # Nobody waits on this write, so a failure must at least be logged
+        future.add_done_callback(functools.partial(_log_write_failure, session_id, len(messages)))
+        
+        for role, content, _, _ in messages:
+            self._remember(session_id, role, content)
     
     def get_conversation_history(
         self, 
         session_id: str, 
         limit: int = 20,
-        include_system: bool = False
+        include_system: bool = False,
+        decode_tool_fields: bool = True
     ) -> List[Dict[str, Any]]:
-        """Retrieve conversation history for a session"""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-        
-        if include_system:
-            query = '''SELECT role, content, tool_calls, tool_results, timestamp 
-                       FROM conversations 
-                       WHERE session_id = ? 
-                       ORDER BY timestamp DESC 
-                       LIMIT ?'''
-        else:
-            query = '''SELECT role, content, tool_calls, tool_results, timestamp 
-                       FROM conversations 
-                       WHERE session_id = ? AND role != 'system'
-                       ORDER BY timestamp DESC 
-                       LIMIT ?'''
-        
-        cursor.execute(query, (session_id, limit))
-        results = cursor.fetchall()
-        conn.close()
-        
-        # Convert to list of dicts (reverse to get chronological order)
+        """Retrieve conversation history for a session
+        
+        With decode_tool_fields=False the tool_calls/tool_results JSON is not
+        parsed and those keys are left out, for callers that only need text.
+        """
+        key = (session_id, limit, include_system, decode_tool_fields)
+        version = self._versions.get(session_id, 0)
+        with self._lock:
+            cached = self._hist_cache.get(key)
+        if cached is not None and cached[0] == version:
+            return list(cached[1])
+        
+        query = self._SQL_HIST_WITH_SYS if include_system else self._SQL_HIST_NO_SYS
+        
+        self.flush()
         history = []
-        for role, content, tool_calls, tool_results, timestamp in reversed(results):
-            message = {
-                "role": role,
-                "content": content,
-                "timestamp": timestamp
-            }
-            
-            if tool_calls:
-                message["tool_calls"] = json.loads(tool_calls)
-            if tool_results:
-                message["tool_results"] = json.loads(tool_results)
+        with self._lock:
+            cursor = self._conn.cursor()
+            for role, content, tool_calls, tool_results, timestamp in cursor.execute(query, (session_id, limit)):
+                message = {
+                    "role": _INT_TO_ROLE[role],
+                    "content": content,
+                    "timestamp": _format_timestamp(timestamp)
+                }
+                
+                if decode_tool_fields:
+                    if tool_calls:
+                        message["tool_calls"] = _json_loads(tool_calls)
+                    if tool_results:
+                        message["tool_results"] = _json_loads(tool_results)
+                
+                history.append(message)
             
-            history.append(message)
+            self._hist_cache.put(key, (version, history))
         
-        return history
+        return list(history)
     
     def format_for_llm(
         self, 
@@ -172,32 +456,104 @@ class ConversationMemory:
                 "content": system_prompt
             })
         
-        # Get conversation history
-        history = self.get_conversation_history(session_id, limit, include_system=False)
+        # Serve from the in-memory window, (re)loading it only when it is too short
+        window = self._hot.get(session_id)
+        if window is None or window.maxlen < limit:
+            window = self._load_window(session_id, max(limit, self.HOT_WINDOW))
         
-        # Convert to simple format for LLM
-        for msg in history:
-            messages.append({
-                "role": msg["role"],
-                "content": msg["content"]
-            })
+        if limit > 0:
+            messages.extend(list(window)[-limit:])
         
         return messages
     
+    def compact_session(
+        self,
+        session_id: str,
+        keep_last: int = 50,
+        summarizer: Optional[Callable[[List[Dict[str, Any]]], str]] = None
+    ) -> int:
+        """Replace all but the newest keep_last messages with one summary row
+        
+        Returns the number of messages folded into the summary.
+        """
+        summarizer = summarizer or self.summarizer
+        if summarizer is None:
+            raise ValueError("compact_session needs a summarizer")
+        
+        self.purge_expired(session_id)
+        with self._lock:
+            cursor = self._conn.cursor()
+            rows = cursor.execute(
+                self._SQL_COMPACTABLE, (session_id, session_id, keep_last)
+            ).fetchall()
+        
+        # A lone previous summary has nothing new to fold in
+        if not rows or (len(rows) == 1 and rows[0][1] == _SUMMARY):
+            return 0
+        
+        summary = summarizer([
+            {"role": _INT_TO_ROLE[role], "content": content} for _, role, content, _ in rows
+        ])
+        if not summary:
+            return 0
+        
+        self._bump_version(session_id)
+        with self._lock, self._conn:
+            cursor = self._conn.cursor()
+            cursor.executemany(
+                'DELETE FROM conversations WHERE id = ?',
+                [(row[0],) for row in rows]
+            )
+            # Dated just before the newest compacted message so it sorts ahead of the kept ones
+            cursor.execute(
+                '''INSERT INTO conversations (session_id, role, content, timestamp) 
+                   VALUES (?, ?, ?, ?)''',
+                (session_id, _SUMMARY, summary, rows[-1][3] - 1)
+            )
+        
+        self._hot.pop(session_id, None)
+        return len(rows)
+    
+    def purge_expired(self, session_id: Optional[str] = None) -> int:
+        """Delete messages older than HISTORY_MAX_AGE_DAYS, for one session or all
+        
+        Returns the number of messages deleted.
+        """
+        cutoff = _now_us() - self.HISTORY_MAX_AGE_DAYS * 86_400_000_000
+        sessions = [session_id] if session_id is not None else list(self._versions)
+        
+        self.flush()
+        # Cached history and windows may hold the rows about to go
+        for sid in sessions:
+            self._bump_version(sid)
+        with self._lock, self._conn:
+            cursor = self._conn.cursor()
+            if session_id is None:
+                cursor.execute(self._SQL_PURGE_ALL, (cutoff,))
+            else:
+                cursor.execute(
+                    'DELETE FROM conversations WHERE session_id = ? AND timestamp < ?',
+                    (session_id, cutoff)
+                )
+            deleted = cursor.rowcount
+        
+        if deleted:
+            for sid in sessions:
+                self._hot.pop(sid, None)
+        return deleted
+    
     def get_session_info(self, session_id: str) -> Optional[Dict[str, Any]]:
         """Get information about a session"""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-        
-        cursor.execute(
-            '''SELECT created_at, last_active, message_count, total_tokens, metadata 
-               FROM sessions 
-               WHERE session_id = ?''',
-            (session_id,)
-        )
-        
-        result = cursor.fetchone()
-        conn.close()
+        self.flush()
+        with self._lock:
+            cursor = self._conn.cursor()
+            cursor.execute(
+                '''SELECT created_at, last_active, message_count, total_tokens, metadata 
+                   FROM sessions 
+                   WHERE session_id = ?''',
+                (session_id,)
+            )
+            result = cursor.fetchone()
         
         if result:
             return {
@@ -206,21 +562,22 @@ class ConversationMemory:
                 "last_active": result[1],
                 "message_count": result[2],
                 "total_tokens": result[3],
-                "metadata": json.loads(result[4]) if result[4] else {}
+                "metadata": _json_loads(result[4]) if result[4] else {}
             }
         return None
     
     def clear_session(self, session_id: str) -> bool:
         """Delete all messages for a session"""
         try:
-            conn = sqlite3.connect(self.db_path)
-            cursor = conn.cursor()
-            
-            cursor.execute('DELETE FROM conversations WHERE session_id = ?', (session_id,))
-            cursor.execute('DELETE FROM sessions WHERE session_id = ?', (session_id,))
+            self.flush()
+            self._bump_version(session_id)
+            with self._lock, self._conn:
+                cursor = self._conn.cursor()
+                cursor.execute('DELETE FROM conversations WHERE session_id = ?', (session_id,))
+                cursor.execute('DELETE FROM sessions WHERE session_id = ?', (session_id,))
             
-            conn.commit()
-            conn.close()
+            self._hot.pop(session_id, None)
+            self._message_counts.pop(session_id, None)
             return True
         except Exception:
             return False
\ No newline at end of file
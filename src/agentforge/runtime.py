@@ -0,0 +1,56 @@
+"""
+AgentForge Runtime Module
+Background event loop shared by the sync entry points
+"""
+
+import asyncio
+import threading
+from typing import Any, AsyncGenerator, Coroutine, Generator, Optional, TypeVar
+
+T = TypeVar("T")
+
+_loop: Optional[asyncio.AbstractEventLoop] = None
+_loop_lock = threading.Lock()
+
+
+def get_loop() -> asyncio.AbstractEventLoop:
+    """Return the shared event loop, starting its thread on first use"""
+    global _loop
+    
+    with _loop_lock:
+        if _loop is None:
+            _loop = asyncio.new_event_loop()
+            thread = threading.Thread(
+                target=_loop.run_forever,
+                name="agentforge-loop",
+                daemon=True
+            )
+            thread.start()
+    
+    return _loop
+
+
+def run_sync(coro: Coroutine[Any, Any, T]) -> T:
+    """Run a coroutine on the shared loop and block until it completes"""
+    return asyncio.run_coroutine_threadsafe(coro, get_loop()).result()
+
+
+async def _anext(agen: AsyncGenerator[T, Any]) -> T:
+    return await agen.__anext__()
+
+
+async def _aclose(agen: AsyncGenerator[T, Any]) -> None:
+    await agen.aclose()
+
+
+def iterate_sync(agen: AsyncGenerator[T, Any]) -> Generator[T, None, None]:
+    """Drive an async generator from synchronous code, one item at a time"""
+    try:
+        while True:
+            try:
+                item = run_sync(_anext(agen))
+            except StopAsyncIteration:
+                return
+            yield item
+    finally:
+        run_sync(_aclose(agen))
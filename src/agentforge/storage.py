@@ -0,0 +1,143 @@
+"""
+AgentForge Storage Module
+Shared SQLite connection setup and batched background writer
+"""
+
+import os
+import queue
+import sqlite3
+import threading
+import weakref
+from concurrent.futures import Future
+from typing import List, Optional, Tuple
+
+
+def connect(db_path: str) -> sqlite3.Connection:
+    """Open one long-lived connection that threads share under a lock"""
+    if os.path.dirname(db_path):
+        os.makedirs(os.path.dirname(db_path), exist_ok=True)
+    return sqlite3.connect(db_path, check_same_thread=False)
+
+
+def apply_pragmas(cursor: sqlite3.Cursor):
+    """Enable WAL journaling with relaxed fsync and larger in-memory caches
+    
+    Must run before any statement opens a transaction.
+    """
+    cursor.execute('PRAGMA journal_mode=WAL')
+    cursor.execute('PRAGMA synchronous=NORMAL')
+    cursor.execute('PRAGMA temp_store=MEMORY')
+    cursor.execute('PRAGMA mmap_size=268435456')
+    cursor.execute('PRAGMA cache_size=-20000')
+
+
+class BatchWriter:
+    """Background thread that commits queued inserts, many entries per transaction
+    
+    Each submitted entry is a list of parameter rows for one INSERT statement;
+    its future resolves with the ids of those rows. The connection is closed
+    once the writer is garbage collected and its queue has drained.
+    """
+    
+    def __init__(
+        self,
+        conn: sqlite3.Connection,
+        lock: threading.Lock,
+        sql: str,
+        name: str,
+        max_batch: int = 500
+    ):
+        self._queue: "queue.Queue[Optional[Tuple[List[Tuple], Future]]]" = queue.Queue()
+        thread = threading.Thread(
+            target=self._run,
+            args=(conn, lock, sql, self._queue, max_batch),
+            name=name,
+            daemon=True
+        )
+        thread.start()
+        weakref.finalize(self, self._shutdown, self._queue, thread, conn)
+    
+    def submit(self, rows: List[Tuple]) -> Future:
+        """Queue rows for insertion; the future resolves with their ids"""
+        future: Future = Future()
+        self._queue.put((rows, future))
+        return future
+    
+    def flush(self):
+        """Block until every queued entry has been committed or failed"""
+        self._queue.join()
+    
+    def pending(self) -> int:
+        """Number of entries waiting for the writer"""
+        return self._queue.qsize()
+    
+    @staticmethod
+    def _run(
+        conn: sqlite3.Connection,
+        lock: threading.Lock,
+        sql: str,
+        write_q: queue.Queue,
+        max_batch: int
+    ):
+        """Drain the queue until the None sentinel arrives"""
+        stop = False
+        while not stop:
+            batch = []
+            entry = write_q.get()
+            while True:
+                if entry is None:
+                    stop = True
+                    write_q.task_done()
+                    break
+                batch.append(entry)
+                if len(batch) >= max_batch:
+                    break
+                try:
+                    entry = write_q.get_nowait()
+                except queue.Empty:
+                    break
+            
+            try:
+                if batch:
+                    BatchWriter._commit(conn, lock, sql, batch)
+            except Exception as e:
+                # Keep the thread alive; callers would otherwise wait forever
+                for _, future in batch:
+                    if not future.done():
+                        future.set_exception(e)
+            finally:
+                for _ in batch:
+                    write_q.task_done()
+    
+    @staticmethod
+    def _commit(conn: sqlite3.Connection, lock: threading.Lock, sql: str, batch: List[Tuple]):
+        """Insert entries in one transaction and resolve their futures with row ids"""
+        rows = [row for entry_rows, _ in batch for row in entry_rows]
+        
+        try:
+            with lock, conn:
+                cursor = conn.cursor()
+                cursor.execute('BEGIN IMMEDIATE')
+                cursor.executemany(sql, rows)
+                last_id = cursor.execute('SELECT last_insert_rowid()').fetchone()[0]
+        except Exception as e:
+            if len(batch) == 1:
+                batch[0][1].set_exception(e)
+            else:
+                # Retry one entry per transaction so a bad row fails only its own entry
+                for entry in batch:
+                    BatchWriter._commit(conn, lock, sql, [entry])
+            return
+        
+        # Rows inserted by one statement in one transaction get consecutive ids
+        next_id = last_id - len(rows) + 1
+        for entry_rows, future in batch:
+            future.set_result(list(range(next_id, next_id + len(entry_rows))))
+            next_id += len(entry_rows)
+    
+    @staticmethod
+    def _shutdown(write_q: queue.Queue, thread: threading.Thread, conn: sqlite3.Connection):
+        """Flush pending writes, stop the writer thread and close the connection"""
+        write_q.put(None)
+        thread.join()
+        conn.close()
@@ -0,0 +1,47 @@
+"""
+AgentForge Streaming Module
+Forwarding of agent events to a UI thread, independent of the UI toolkit
+"""
+
+# Marks the end of an agent run in the step queue
+STREAM_DONE = object()
+
+
+def batch_tokens(events, start=1, factor=3, cap=50):
+    """Merge runs of token events into growing batches (1, 3, 9, 27, 50, ...)
+    
+    The first token is forwarded alone for fast first paint; later ones are
+    grouped so the UI re-renders logarithmically less often. Any other event
+    flushes the pending batch and passes through unchanged.
+    """
+    size = start
+    pending = []
+    
+    for event in events:
+        if event['type'] == 'token':
+            pending.append(event['content'])
+            if len(pending) >= size:
+                yield {'type': 'token', 'content': "".join(pending)}
+                pending = []
+                size = min(size * factor, cap)
+            continue
+        
+        if pending:
+            yield {'type': 'token', 'content': "".join(pending)}
+            pending = []
+        size = start
+        yield event
+    
+    if pending:
+        yield {'type': 'token', 'content': "".join(pending)}
+
+
+def drain_agent(agent, prompt, steps):
+    """Run the agent in a worker thread and forward each step to the queue"""
+    try:
+        for step in batch_tokens(agent.chat(prompt)):
+            steps.put(step)
+    except Exception as e:
+        steps.put(e)
+    finally:
+        steps.put(STREAM_DONE)
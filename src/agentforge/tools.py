@@ -3,196 +3,454 @@ AgentForge Tools Module
 Defines all available tools and their implementations
 """
 
+import ast
+import asyncio
+import atexit
+import functools
+import importlib.util
 import json
+import math
 import sqlite3
-import os
+import threading
+import time
 from datetime import datetime
-from typing import Dict, List, Any
-import requests
+from types import MappingProxyType
+from typing import Dict, List, Any, Optional, Tuple
+import httpx
 from duckduckgo_search import DDGS
 
+from .cache import LRUCache, SemanticCache
+from .runtime import run_sync
+from .storage import BatchWriter, apply_pragmas, connect
 
-class ToolRegistry:
-    """Registry of all available tools for the agent"""
+try:
+    import orjson
     
-    @staticmethod
-    def get_tool_definitions() -> List[Dict[str, Any]]:
-        """Returns OpenAI function calling format tool definitions"""
-        return [
-            {
-                "type": "function",
-                "function": {
-                    "name": "web_search",
-                    "description": "Search the web for current information, news, facts, or answers. Use this when you need up-to-date information beyond your knowledge cutoff.",
-                    "parameters": {
-                        "type": "object",
-                        "properties": {
-                            "query": {
-                                "type": "string",
-                                "description": "The search query (e.g., 'latest AI news', 'weather in Paris')"
-                            },
-                            "num_results": {
-                                "type": "integer",
-                                "description": "Number of results to return (1-10)",
-                                "default": 3
-                            }
-                        },
-                        "required": ["query"]
-                    }
-                }
-            },
-            {
-                "type": "function",
-                "function": {
-                    "name": "calculator",
-                    "description": "Evaluate mathematical expressions and perform calculations. Supports basic arithmetic, exponents, and common math functions (sqrt, sin, cos, log, etc.).",
-                    "parameters": {
-                        "type": "object",
-                        "properties": {
-                            "expression": {
-                                "type": "string",
-                                "description": "Mathematical expression to evaluate (e.g., '2 + 2', 'sqrt(16)', '10 ** 2', 'sin(3.14159/2)')"
-                            }
-                        },
-                        "required": ["expression"]
+    _json_dumps = orjson.dumps
+    _json_loads = orjson.loads
+except ImportError:
+    def _json_dumps(obj: Any) -> bytes:
+        return json.dumps(obj).encode()
+    
+    _json_loads = json.loads
+
+# httpx speaks HTTP/2 only when the optional h2 package is installed
+_HTTP2 = importlib.util.find_spec("h2") is not None
+
+_http_client: Optional[httpx.AsyncClient] = None
+
+# Formatted weather reports by normalized city: (fetched at, report)
+_WEATHER_CACHE: Dict[str, Tuple[float, str]] = {}
+_WEATHER_TTL = 300.0
+_WEATHER_CACHE_SIZE = 256
+
+# Formatted search results, by exact query first and then by query meaning,
+# stored as (fetched at, results) and served for _SEARCH_TTL seconds
+_SEARCH_TTL = 300.0
+_SEARCH_EXACT_CACHE = LRUCache(maxsize=1024)
+_SEARCH_SEMANTIC_CACHE = SemanticCache(threshold=0.95, maxsize=1024)
+# Searches run in worker threads and the caches are not thread-safe
+_SEARCH_CACHE_LOCK = threading.Lock()
+
+
+def _get_http_client() -> httpx.AsyncClient:
+    """Shared HTTP client so tool requests reuse pooled connections"""
+    global _http_client
+    
+    if _http_client is None:
+        _http_client = httpx.AsyncClient(
+            http2=_HTTP2,
+            limits=httpx.Limits(max_connections=32, max_keepalive_connections=16),
+            timeout=10.0
+        )
+        atexit.register(_close_http_client)
+    
+    return _http_client
+
+
+def _close_http_client():
+    """Close the shared HTTP client on interpreter exit"""
+    try:
+        run_sync(_http_client.aclose())
+    except Exception:
+        pass
+
+
+# OpenAI function calling format tool definitions, built once at import
+_TOOL_DEFS: List[Dict[str, Any]] = [
+    {
+        "type": "function",
+        "function": {
+            "name": "web_search",
+            "description": "Search the web for current information, news, facts, or answers. Use this when you need up-to-date information beyond your knowledge cutoff.",
+            "parameters": {
+                "type": "object",
+                "properties": {
+                    "query": {
+                        "type": "string",
+                        "description": "The search query (e.g., 'latest AI news', 'weather in Paris')"
+                    },
+                    "num_results": {
+                        "type": "integer",
+                        "description": "Number of results to return (1-10)",
+                        "default": 3
                     }
-                }
-            },
-            {
-                "type": "function",
-                "function": {
-                    "name": "get_weather",
-                    "description": "Get current weather information for any city in the world. Returns temperature, conditions, humidity, and wind speed.",
-                    "parameters": {
-                        "type": "object",
-                        "properties": {
-                            "city": {
-                                "type": "string",
-                                "description": "City name (e.g., 'London', 'New York', 'Tokyo')"
-                            }
-                        },
-                        "required": ["city"]
+                },
+                "required": ["query"]
+            }
+        }
+    },
+    {
+        "type": "function",
+        "function": {
+            "name": "calculator",
+            "description": "Evaluate mathematical expressions and perform calculations. Supports basic arithmetic, exponents, and common math functions (sqrt, sin, cos, log, etc.).",
+            "parameters": {
+                "type": "object",
+                "properties": {
+                    "expression": {
+                        "type": "string",
+                        "description": "Mathematical expression to evaluate (e.g., '2 + 2', 'sqrt(16)', '10 ** 2', 'sin(3.14159/2)')"
                     }
-                }
-            },
-            {
-                "type": "function",
-                "function": {
-                    "name": "save_note",
-                    "description": "Save a note, task, or reminder to the database for later retrieval. Perfect for to-do lists, important information, or things to remember.",
-                    "parameters": {
-                        "type": "object",
-                        "properties": {
-                            "title": {
-                                "type": "string",
-                                "description": "Brief title for the note (e.g., 'Shopping List', 'Meeting Notes')"
-                            },
-                            "content": {
-                                "type": "string",
-                                "description": "The full content of the note"
-                            },
-                            "tags": {
-                                "type": "string",
-                                "description": "Optional comma-separated tags (e.g., 'work,urgent')"
-                            }
-                        },
-                        "required": ["title", "content"]
+                },
+                "required": ["expression"]
+            }
+        }
+    },
+    {
+        "type": "function",
+        "function": {
+            "name": "get_weather",
+            "description": "Get current weather information for any city in the world. Returns temperature, conditions, humidity, and wind speed.",
+            "parameters": {
+                "type": "object",
+                "properties": {
+                    "city": {
+                        "type": "string",
+                        "description": "City name (e.g., 'London', 'New York', 'Tokyo')"
                     }
-                }
-            },
-            {
-                "type": "function",
-                "function": {
-                    "name": "get_notes",
-                    "description": "Retrieve saved notes from the database. Can search by keyword or retrieve all notes.",
-                    "parameters": {
-                        "type": "object",
-                        "properties": {
-                            "search_term": {
-                                "type": "string",
-                                "description": "Optional search term to filter notes by title, content, or tags"
-                            },
-                            "limit": {
-                                "type": "integer",
-                                "description": "Maximum number of notes to return (default: 10)",
-                                "default": 10
-                            }
-                        }
+                },
+                "required": ["city"]
+            }
+        }
+    },
+    {
+        "type": "function",
+        "function": {
+            "name": "save_note",
+            "description": "Save a note, task, or reminder to the database for later retrieval. Perfect for to-do lists, important information, or things to remember.",
+            "parameters": {
+                "type": "object",
+                "properties": {
+                    "title": {
+                        "type": "string",
+                        "description": "Brief title for the note (e.g., 'Shopping List', 'Meeting Notes')"
+                    },
+                    "content": {
+                        "type": "string",
+                        "description": "The full content of the note"
+                    },
+                    "tags": {
+                        "type": "string",
+                        "description": "Optional comma-separated tags (e.g., 'work,urgent')"
                     }
-                }
-            },
-            {
-                "type": "function",
-                "function": {
-                    "name": "get_current_datetime",
-                    "description": "Get the current date, time, and day of the week.",
-                    "parameters": {
-                        "type": "object",
-                        "properties": {}
+                },
+                "required": ["title", "content"]
+            }
+        }
+    },
+    {
+        "type": "function",
+        "function": {
+            "name": "get_notes",
+            "description": "Retrieve saved notes from the database. Can search by keyword or retrieve all notes.",
+            "parameters": {
+                "type": "object",
+                "properties": {
+                    "search_term": {
+                        "type": "string",
+                        "description": "Optional search term to filter notes by title, content, or tags"
+                    },
+                    "limit": {
+                        "type": "integer",
+                        "description": "Maximum number of notes to return (default: 10)",
+                        "default": 10
                     }
                 }
             }
-        ]
+        }
+    },
+    {
+        "type": "function",
+        "function": {
+            "name": "get_current_datetime",
+            "description": "Get the current date, time, and day of the week.",
+            "parameters": {
+                "type": "object",
+                "properties": {}
+            }
+        }
+    }
+]
+
+_TOOL_DEFS_JSON = _json_dumps(_TOOL_DEFS)
+
+
+class ToolRegistry:
+    """Registry of all available tools for the agent"""
+    
+    @staticmethod
+    def get_tool_definitions() -> List[Dict[str, Any]]:
+        """Returns OpenAI function calling format tool definitions"""
+        return _TOOL_DEFS
+    
+    @staticmethod
+    def get_tool_definitions_json() -> bytes:
+        """Returns the tool definitions pre-serialized as JSON"""
+        return _TOOL_DEFS_JSON
+
+
+# Names the calculator may reference, built once and read-only
+_SAFE_DICT = MappingProxyType({
+    'sqrt': math.sqrt,
+    'sin': math.sin,
+    'cos': math.cos,
+    'tan': math.tan,
+    'log': math.log,
+    'log10': math.log10,
+    'exp': math.exp,
+    'pi': math.pi,
+    'e': math.e,
+    'abs': abs,
+    'round': round,
+    'pow': pow
+})
+_CALC_MAX_LENGTH = 200
+_CALC_NODES = (
+    ast.Expression, ast.BinOp, ast.UnaryOp, ast.Call, ast.Name, ast.Load, ast.Constant,
+    ast.operator, ast.unaryop
+)
+
+
+@functools.lru_cache(maxsize=256)
+def _compile_expression(expression: str):
+    """Validate a calculator expression and compile it once"""
+    if len(expression) > _CALC_MAX_LENGTH:
+        raise ValueError(f"Expression too long (max {_CALC_MAX_LENGTH} characters)")
+    
+    tree = ast.parse(expression, mode='eval')
+    for node in ast.walk(tree):
+        if not isinstance(node, _CALC_NODES):
+            raise ValueError(f"Unsupported syntax: {type(node).__name__}")
+        if isinstance(node, ast.Name) and node.id not in _SAFE_DICT:
+            raise ValueError(f"Unknown name: {node.id}")
+        if isinstance(node, ast.Call) and (node.keywords or not isinstance(node.func, ast.Name)):
+            raise ValueError("Only plain calls to math functions are allowed")
+        if isinstance(node, ast.Constant) and not isinstance(node.value, (int, float, complex)):
+            raise ValueError("Only numeric constants are allowed")
+    
+    return compile(tree, '<calculator>', 'eval')
+
+
+@functools.lru_cache(maxsize=1)
+def _format_datetime(timestamp: int) -> str:
+    """Format a whole-second local time; repeat calls within the second are cache hits"""
+    now = datetime.fromtimestamp(timestamp)
+    
+    return (
+        f"🕒 **Current Date & Time:**\n\n"
+        f"📅 Date: {now.strftime('%A, %B %d, %Y')}\n"
+        f"⏰ Time: {now.strftime('%I:%M:%S %p')}\n"
+        f"📊 Week: {now.strftime('Week %W of %Y')}"
+    )
+
+
+# Tools called without arguments regardless of what the model passes
+_NO_ARG_TOOLS = frozenset({'get_current_datetime'})
+
+
+# The trigram index cannot serve shorter search terms
+_FTS_MIN_TERM = 3
+
+
+def _fts_query(search_term: str) -> str:
+    """Quote a search term as one FTS5 phrase, i.e. a substring under the trigram tokenizer"""
+    return '"' + search_term.replace('"', '""') + '"'
 
 
 class ToolExecutor:
     """Executes tools and returns results"""
     
+    # Most queued notes committed together in one transaction
+    WRITE_BATCH = 500
+    
     def __init__(self, db_path: str = "database/agentforge.db"):
         self.db_path = db_path
+        self._http = _get_http_client()
+        
+        # One long-lived connection, shared across threads under a lock
+        # (sync tools run in worker threads via asyncio.to_thread)
+        self._conn = connect(self.db_path)
+        self._lock = threading.Lock()
+        
         self._ensure_database()
+        
+        # A single writer thread commits queued notes in batched transactions
+        self._notes_writer = BatchWriter(
+            self._conn,
+            self._lock,
+            'INSERT INTO notes (title, content, tags) VALUES (?, ?, ?)',
+            name="agentforge-notes-writer",
+            max_batch=self.WRITE_BATCH
+        )
+        
+        # Dispatch table resolved once: name -> (bound method, is coroutine function)
+        self._tool_methods = {
+            name: (method, asyncio.iscoroutinefunction(method))
+            for name, method in (
+                ('web_search', self.web_search),
+                ('calculator', self.calculator),
+                ('get_weather', self.get_weather),
+                ('save_note', self.save_note),
+                ('get_notes', self.get_notes),
+                ('get_current_datetime', self.get_current_datetime)
+            )
+        }
     
     def _ensure_database(self):
         """Ensure database and tables exist"""
-        os.makedirs(os.path.dirname(self.db_path), exist_ok=True)
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
+        with self._lock, self._conn:
+            cursor = self._conn.cursor()
+            apply_pragmas(cursor)
+            
+            cursor.execute('''
+                CREATE TABLE IF NOT EXISTS notes (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    title TEXT NOT NULL,
+                    content TEXT NOT NULL,
+                    tags TEXT,
+                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+                )
+            ''')
+            
+            # Full-text index over notes, kept in sync by triggers
+            self._fts = self._ensure_notes_fts(cursor)
+    
+    def _ensure_notes_fts(self, cursor: sqlite3.Cursor) -> bool:
+        """Create the notes_fts index; False if this SQLite build lacks FTS5 trigrams
         
-        cursor.execute('''
-            CREATE TABLE IF NOT EXISTS notes (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                title TEXT NOT NULL,
-                content TEXT NOT NULL,
-                tags TEXT,
-                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-            )
+        The trigram tokenizer makes MATCH a substring search, the same results
+        as the LIKE fallback.
+        """
+        existing = cursor.execute(
+            "SELECT sql FROM sqlite_master WHERE type = 'table' AND name = 'notes_fts'"
+        ).fetchone()
+        exists = existing is not None and 'trigram' in existing[0]
+        
+        if existing is not None and not exists:
+            # Built with the word tokenizer, which only matches word prefixes
+            cursor.executescript('''
+                DROP TRIGGER IF EXISTS notes_fts_insert;
+                DROP TRIGGER IF EXISTS notes_fts_delete;
+                DROP TRIGGER IF EXISTS notes_fts_update;
+                DROP TABLE notes_fts;
+            ''')
+        
+        try:
+            cursor.execute('''
+                CREATE VIRTUAL TABLE IF NOT EXISTS notes_fts 
+                USING fts5(title, content, tags, content='notes', content_rowid='id', tokenize='trigram')
+            ''')
+        except sqlite3.OperationalError:
+            return False
+        
+        cursor.executescript('''
+            CREATE TRIGGER IF NOT EXISTS notes_fts_insert AFTER INSERT ON notes BEGIN
+                INSERT INTO notes_fts (rowid, title, content, tags) 
+                VALUES (new.id, new.title, new.content, new.tags);
+            END;
+            
+            CREATE TRIGGER IF NOT EXISTS notes_fts_delete AFTER DELETE ON notes BEGIN
+                INSERT INTO notes_fts (notes_fts, rowid, title, content, tags) 
+                VALUES ('delete', old.id, old.title, old.content, old.tags);
+            END;
+            
+            CREATE TRIGGER IF NOT EXISTS notes_fts_update AFTER UPDATE ON notes BEGIN
+                INSERT INTO notes_fts (notes_fts, rowid, title, content, tags) 
+                VALUES ('delete', old.id, old.title, old.content, old.tags);
+                INSERT INTO notes_fts (rowid, title, content, tags) 
+                VALUES (new.id, new.title, new.content, new.tags);
+            END;
         ''')
         
-        conn.commit()
-        conn.close()
+        # Index notes written before the FTS table existed
+        if not exists:
+            cursor.execute("INSERT INTO notes_fts (notes_fts) VALUES ('rebuild')")
+        
+        return True
     
     def execute(self, tool_name: str, arguments: Dict[str, Any]) -> str:
         """Execute a tool by name with given arguments"""
-        
-        tool_methods = {
-            'web_search': self.web_search,
-            'calculator': self.calculator,
-            'get_weather': self.get_weather,
-            'save_note': self.save_note,
-            'get_notes': self.get_notes,
-            'get_current_datetime': self.get_current_datetime
-        }
-        
-        if tool_name not in tool_methods:
+        return run_sync(self.aexecute(tool_name, arguments))
+    
+    async def aexecute(self, tool_name: str, arguments: Dict[str, Any]) -> str:
+        """Execute a tool asynchronously, running blocking tools in a worker thread"""
+        entry = self._tool_methods.get(tool_name)
+        if entry is None:
             return f"❌ Error: Unknown tool '{tool_name}'"
         
+        method, is_async = entry
+        
         try:
-            # Special handling for tools that don't need arguments
-            if tool_name == 'get_current_datetime':
-                result = tool_methods[tool_name]()
-            elif tool_name == 'get_notes' and not arguments:
-                result = tool_methods[tool_name]()
+            # Tools that take no arguments ignore whatever the model sent
+            if tool_name in _NO_ARG_TOOLS:
+                kwargs = {}
             else:
                 # Filter out None values from arguments
-                clean_args = {k: v for k, v in arguments.items() if v is not None}
-                result = tool_methods[tool_name](**clean_args)
-            return result
+                kwargs = {k: v for k, v in arguments.items() if v is not None}
+            
+            if is_async:
+                return await method(**kwargs)
+            return await asyncio.to_thread(method, **kwargs)
         except Exception as e:
             return f"❌ Error executing {tool_name}: {str(e)}"
     
+    def execute_many(self, calls: List[Tuple[str, Dict[str, Any]]]) -> List[str]:
+        """Execute several (tool_name, arguments) calls concurrently, results in call order"""
+        return run_sync(self.aexecute_many(calls))
+    
+    async def aexecute_many(self, calls: List[Tuple[str, Dict[str, Any]]]) -> List[str]:
+        """Execute several tools concurrently so their network waits overlap"""
+        results = await asyncio.gather(
+            *(self.aexecute(tool_name, arguments) for tool_name, arguments in calls),
+            return_exceptions=True
+        )
+        
+        # One failing tool must not discard the others' results
+        return [
+            f"❌ Error executing {tool_name}: {str(result)}" if isinstance(result, BaseException) else result
+            for (tool_name, _), result in zip(calls, results)
+        ]
+    
     def web_search(self, query: str, num_results: int = 3) -> str:
         """Search the web using DuckDuckGo"""
+        key = (" ".join(query.lower().split()), num_results)
+        now = time.monotonic()
+        with _SEARCH_CACHE_LOCK:
+            cached = _SEARCH_EXACT_CACHE.get(key)
+        if cached is not None and now - cached[0] < _SEARCH_TTL:
+            return cached[1]
+        
+        # Embed outside the lock so concurrent searches do not queue behind
+        # model inference; the lock only guards the LSH tables
+        vector = _SEARCH_SEMANTIC_CACHE.embed(key[0])
+        if vector is not None:
+            with _SEARCH_CACHE_LOCK:
+                cached = _SEARCH_SEMANTIC_CACHE.lookup(vector, namespace=str(num_results))
+            if cached is not None and now - cached[0] < _SEARCH_TTL:
+                return cached[1]
+        
         try:
             with DDGS() as ddgs:
                 results = list(ddgs.text(query, max_results=num_results))
@@ -208,7 +466,13 @@ class ToolExecutor:
                     f"   📝 {result['body']}\n"
                 )
             
-            return "\n".join(formatted_results)
+            formatted = "\n".join(formatted_results)
+            entry = (time.monotonic(), formatted)
+            with _SEARCH_CACHE_LOCK:
+                _SEARCH_EXACT_CACHE.put(key, entry)
+                if vector is not None:
+                    _SEARCH_SEMANTIC_CACHE.store(vector, entry, namespace=str(num_results))
+            return formatted
         
         except Exception as e:
             return f"❌ Search error: {str(e)}"
@@ -216,43 +480,30 @@ class ToolExecutor:
     def calculator(self, expression: str) -> str:
         """Safely evaluate mathematical expressions"""
         try:
-            import math
-            
-            # Safe namespace with math functions
-            safe_dict = {
-                'sqrt': math.sqrt,
-                'sin': math.sin,
-                'cos': math.cos,
-                'tan': math.tan,
-                'log': math.log,
-                'log10': math.log10,
-                'exp': math.exp,
-                'pi': math.pi,
-                'e': math.e,
-                'abs': abs,
-                'round': round,
-                'pow': pow
-            }
-            
-            # Evaluate expression
-            result = eval(expression, {"__builtins__": {}}, safe_dict)
+            result = eval(_compile_expression(expression), {"__builtins__": {}}, _SAFE_DICT)
             
             return f"🧮 Calculation Result:\n{expression} = **{result}**"
         
         except Exception as e:
             return f"❌ Calculation error: {str(e)}\nMake sure your expression is valid (e.g., '2 + 2', 'sqrt(16)')"
     
-    def get_weather(self, city: str) -> str:
+    async def get_weather(self, city: str) -> str:
         """Get weather using free wttr.in API"""
+        key = city.strip().lower()
+        cached = _WEATHER_CACHE.get(key)
+        if cached is not None and time.monotonic() - cached[0] < _WEATHER_TTL:
+            return cached[1]
+        
         try:
             url = f"https://wttr.in/{city}?format=j1"
-            response = requests.get(url, timeout=10)
+            response = await self._http.get(url)
             
             if response.status_code == 200:
-                data = response.json()
+                # Decode the raw body directly, skipping httpx's charset detection
+                data = _json_loads(response.content)
                 current = data['current_condition'][0]
                 
-                return (
+                report = (
                     f"🌤️ **Weather in {city}:**\n\n"
                     f"🌡️ Temperature: {current['temp_C']}°C ({current['temp_F']}°F)\n"
                     f"☁️ Condition: {current['weatherDesc'][0]['value']}\n"
@@ -261,30 +512,27 @@ class ToolExecutor:
                     f"👁️ Visibility: {current['visibility']} km\n"
                     f"🌡️ Feels like: {current['FeelsLikeC']}°C ({current['FeelsLikeF']}°F)"
                 )
+                
+                # Drop the oldest entry rather than grow without bound
+                _WEATHER_CACHE.pop(key, None)
+                if len(_WEATHER_CACHE) >= _WEATHER_CACHE_SIZE:
+                    del _WEATHER_CACHE[next(iter(_WEATHER_CACHE))]
+                _WEATHER_CACHE[key] = (time.monotonic(), report)
+                return report
             else:
                 return f"❌ Could not fetch weather for '{city}'. Status code: {response.status_code}"
         
-        except Exception as e:
-            return f"❌ Weather error for '{city}': {str(e)}"
-        except requests.Timeout:
+        except httpx.TimeoutException:
             return f"⏱️ Weather service timed out for '{city}'. The service may be temporarily unavailable."
-        except requests.ConnectionError:
+        except httpx.ConnectError:
             return f"🌐 Could not connect to weather service for '{city}'. Please check your internet connection."
+        except Exception as e:
+            return f"❌ Weather error for '{city}': {str(e)}"
     
     def save_note(self, title: str, content: str, tags: str = None) -> str:
         """Save a note to the database"""
         try:
-            conn = sqlite3.connect(self.db_path)
-            cursor = conn.cursor()
-            
-            cursor.execute(
-                'INSERT INTO notes (title, content, tags) VALUES (?, ?, ?)',
-                (title, content, tags)
-            )
-            
-            note_id = cursor.lastrowid
-            conn.commit()
-            conn.close()
+            note_id = self.save_notes_bulk([(title, content, tags)])[0]
             
             return (
                 f"✅ **Note Saved Successfully!**\n\n"
@@ -296,58 +544,64 @@ class ToolExecutor:
         except Exception as e:
             return f"❌ Error saving note: {str(e)}"
     
+    def save_notes_bulk(self, notes: List[Tuple[str, str, Optional[str]]]) -> List[int]:
+        """Save several (title, content, tags) notes in one transaction and return their ids"""
+        if not notes:
+            return []
+        
+        return self._notes_writer.submit(list(notes)).result()
+    
     def get_notes(self, search_term: str = None, limit: int = 10) -> str:
         """Retrieve notes from the database"""
         try:
-            conn = sqlite3.connect(self.db_path)
-            cursor = conn.cursor()
-            
-            if search_term:
-                cursor.execute(
-                    '''SELECT id, title, content, tags, created_at 
-                       FROM notes 
-                       WHERE title LIKE ? OR content LIKE ? OR tags LIKE ?
-                       ORDER BY created_at DESC 
-                       LIMIT ?''',
-                    (f'%{search_term}%', f'%{search_term}%', f'%{search_term}%', limit)
-                )
-            else:
-                cursor.execute(
-                    '''SELECT id, title, content, tags, created_at 
-                       FROM notes 
-                       ORDER BY created_at DESC 
-                       LIMIT ?''',
-                    (limit,)
-                )
-            
-            results = cursor.fetchall()
-            conn.close()
-            
-            if not results:
-                return "📝 No notes found." + (f" Search term: '{search_term}'" if search_term else "")
-            
-            formatted_notes = [f"📚 **Found {len(results)} note(s):**\n"]
-            
-            for note_id, title, content, tags, created_at in results:
-                formatted_notes.append(
+            with self._lock:
+                cursor = self._conn.cursor()
+                
+                if search_term and self._fts and len(search_term) >= _FTS_MIN_TERM:
+                    cursor.execute(
+                        '''SELECT n.id, n.title, n.content, n.tags, n.created_at 
+                           FROM notes n 
+                           JOIN notes_fts f ON f.rowid = n.id 
+                           WHERE notes_fts MATCH ? 
+                           ORDER BY f.rank 
+                           LIMIT ?''',
+                        (_fts_query(search_term), limit)
+                    )
+                elif search_term:
+                    cursor.execute(
+                        '''SELECT id, title, content, tags, created_at 
+                           FROM notes 
+                           WHERE title LIKE ? OR content LIKE ? OR tags LIKE ?
+                           ORDER BY created_at DESC 
+                           LIMIT ?''',
+                        (f'%{search_term}%', f'%{search_term}%', f'%{search_term}%', limit)
+                    )
+                else:
+                    cursor.execute(
+                        '''SELECT id, title, content, tags, created_at 
+                           FROM notes 
+                           ORDER BY created_at DESC 
+                           LIMIT ?''',
+                        (limit,)
+                    )
+                
+                # Format straight off the cursor; no intermediate row list
+                formatted_notes = [
                     f"\n📝 **{title}** (ID: {note_id})\n"
                     f"   {content}\n"
                     f"   📌 Tags: {tags if tags else 'None'}\n"
                     f"   🕒 Created: {created_at}"
-                )
+                    for note_id, title, content, tags, created_at in cursor
+                ]
             
-            return "\n".join(formatted_notes)
+            if not formatted_notes:
+                return "📝 No notes found." + (f" Search term: '{search_term}'" if search_term else "")
+            
+            return f"📚 **Found {len(formatted_notes)} note(s):**\n\n" + "\n".join(formatted_notes)
         
         except Exception as e:
             return f"❌ Error retrieving notes: {str(e)}"
     
     def get_current_datetime(self) -> str:
         """Get current date and time"""
-        now = datetime.now()
-        
-        return (
-            f"🕒 **Current Date & Time:**\n\n"
-            f"📅 Date: {now.strftime('%A, %B %d, %Y')}\n"
-            f"⏰ Time: {now.strftime('%I:%M:%S %p')}\n"
-            f"📊 Week: {now.strftime('Week %W of %Y')}"
-        )
\ No newline at end of file
+        return _format_datetime(int(time.time()))
\ No newline at end of file
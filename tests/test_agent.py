@@ -0,0 +1,112 @@
+import threading
+from types import SimpleNamespace
+
+import pytest
+
+from agentforge import AgentForge
+from agentforge.agent import _trim_messages
+
+
+def _conversation(turns):
+    messages = [{"role": "system", "content": "prompt"}]
+    for i in range(turns):
+        messages.append({"role": "user", "content": f"q{i}"})
+        messages.append({"role": "assistant", "content": f"a{i}"})
+    return messages
+
+
+def test_trim_keeps_short_context():
+    messages = _conversation(3)
+    assert _trim_messages(messages, messages[-2], 24) is messages
+
+
+def test_trim_keeps_system_pinned_and_newest():
+    messages = _conversation(10)
+    pinned = messages[1]
+    trimmed = _trim_messages(messages, pinned, 6)
+    
+    assert len(trimmed) == 6
+    assert trimmed[0] is messages[0]
+    assert trimmed[1] is pinned
+    assert trimmed[2:] == messages[-4:]
+
+
+def test_trim_does_not_split_tool_calls_from_responses():
+    messages = _conversation(5)
+    pinned = messages[-1]
+    messages += [
+        {"role": "assistant", "content": "", "tool_calls": [{"id": "1"}, {"id": "2"}]},
+        {"role": "tool", "tool_call_id": "1", "content": "r1"},
+        {"role": "tool", "tool_call_id": "2", "content": "r2"},
+    ]
+    trimmed = _trim_messages(messages, pinned, 4)
+    
+    assert trimmed[0] is messages[0]
+    assert trimmed[1]["role"] != "tool"
+    assert trimmed[-3]["tool_calls"]
+    assert [m["role"] for m in trimmed[-2:]] == ["tool", "tool"]
+
+
+class _FakeCompletions:
+    def __init__(self, reply):
+        self.reply = reply
+        self.calls = 0
+    
+    async def create(self, **request):
+        self.calls += 1
+        return self._stream()
+    
+    async def _stream(self):
+        delta = SimpleNamespace(content=self.reply, tool_calls=None)
+        yield SimpleNamespace(usage=None, choices=[SimpleNamespace(delta=delta)])
+        yield SimpleNamespace(usage=SimpleNamespace(total_tokens=7), choices=[])
+
+
+@pytest.fixture
+def agent(tmp_path, monkeypatch):
+    monkeypatch.setenv("GROQ_API_KEY", "test-key")
+    agent = AgentForge(db_path=str(tmp_path / "agent.db"))
+    agent.aclient = SimpleNamespace(chat=SimpleNamespace(completions=_FakeCompletions("Why not?")))
+    return agent
+
+
+def _responses(agent, message):
+    return [event["content"] for event in agent.chat(message) if event["type"] == "response"]
+
+
+def test_repeated_turn_is_served_from_cache(agent):
+    completions = agent.aclient.chat.completions
+    
+    for _ in range(3):
+        assert _responses(agent, "tell me a joke") == ["Why not?"]
+    assert completions.calls == 1
+    
+    # The cached answer is still recorded in the session history
+    agent.memory.flush()
+    history = agent.memory.get_conversation_history(agent.session_id)
+    assert [m["content"] for m in history] == ["tell me a joke", "Why not?"] * 3
+
+
+def test_cache_scope_ignores_history(agent):
+    first_key, first_namespace = agent._cache_keys("tell me a joke")
+    _responses(agent, "something else")
+    second_key, second_namespace = agent._cache_keys("tell me a joke")
+    
+    assert (first_key, first_namespace) == (second_key, second_namespace)
+    assert agent._cache_keys("another joke")[1] == first_namespace
+
+
+def test_turn_keeps_memory_io_off_the_event_loop(agent, monkeypatch):
+    threads = []
+    flush = agent.memory.flush
+    
+    def recording_flush():
+        threads.append(threading.current_thread().name)
+        flush()
+    
+    monkeypatch.setattr(agent.memory, "flush", recording_flush)
+    _responses(agent, "hello")
+    _responses(agent, "hello again")
+    
+    assert threads
+    assert "agentforge-loop" not in threads
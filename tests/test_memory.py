@@ -0,0 +1,184 @@
+import logging
+import sqlite3
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+
+from agentforge.memory import ConversationMemory
+
+
+BASELINE_SCHEMA = '''
+    CREATE TABLE conversations (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        session_id TEXT NOT NULL,
+        role TEXT NOT NULL,
+        content TEXT NOT NULL,
+        tool_calls TEXT,
+        tool_results TEXT,
+        timestamp TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+        tokens_used INTEGER DEFAULT 0
+    );
+    CREATE TABLE sessions (
+        session_id TEXT PRIMARY KEY,
+        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+        last_active TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+        message_count INTEGER DEFAULT 0,
+        total_tokens INTEGER DEFAULT 0,
+        metadata TEXT
+    );
+    CREATE INDEX idx_session_id ON conversations(session_id);
+    CREATE INDEX idx_timestamp ON conversations(timestamp);
+'''
+
+
+def test_migrates_baseline_database(tmp_path):
+    db_path = str(tmp_path / "baseline.db")
+    stamp = (datetime.now(timezone.utc) - timedelta(hours=1)).strftime('%Y-%m-%d %H:%M:%S')
+    
+    conn = sqlite3.connect(db_path)
+    conn.executescript(BASELINE_SCHEMA)
+    conn.executemany(
+        'INSERT INTO conversations (session_id, role, content, tool_calls, timestamp) VALUES (?, ?, ?, ?, ?)',
+        [
+            ("s1", "user", "hello", None, stamp),
+            ("s1", "assistant", "hi there", '[{"id": "call_1"}]', stamp),
+            ("s1", "tool", "42", None, stamp),
+        ]
+    )
+    conn.execute("INSERT INTO sessions (session_id, message_count) VALUES ('s1', 3)")
+    conn.commit()
+    conn.close()
+    
+    memory = ConversationMemory(db_path=db_path)
+    
+    columns = {row[1]: row[2] for row in memory._conn.execute('PRAGMA table_info(conversations)')}
+    assert columns["role"].upper() == "INTEGER"
+    assert columns["timestamp"].upper() == "INTEGER"
+    
+    history = memory.get_conversation_history("s1")
+    assert [m["role"] for m in history] == ["user", "assistant", "tool"]
+    assert [m["content"] for m in history] == ["hello", "hi there", "42"]
+    assert all(m["timestamp"] == stamp for m in history)
+    assert history[1]["tool_calls"] == [{"id": "call_1"}]
+    
+    # New rows land after the migrated ones
+    memory.add_message("s1", "user", "again")
+    assert memory.get_conversation_history("s1")[-1]["content"] == "again"
+
+
+def test_ids_backfilled_across_multi_entry_batch(tmp_path):
+    memory = ConversationMemory(db_path=str(tmp_path / "batch.db"))
+    results = {}
+    
+    def add(session_id, content):
+        results[content] = memory.add_message(session_id, "user", content)
+    
+    threads = [
+        threading.Thread(target=add, args=(f"s{i % 3}", f"message {i}"))
+        for i in range(12)
+    ]
+    
+    # Hold the connection lock so every entry queues up and commits in one batch
+    with memory._lock:
+        memory.add_messages_bulk("bulk", [("user", f"bulk {i}", None, 0) for i in range(5)])
+        for thread in threads:
+            thread.start()
+        while memory._writer.pending() < len(threads):
+            time.sleep(0.01)
+    for thread in threads:
+        thread.join()
+    memory.flush()
+    
+    rows = dict(memory._conn.execute('SELECT content, id FROM conversations').fetchall())
+    assert len(rows) == 17
+    assert results == {content: rows[content] for content in results}
+    assert len(set(results.values())) == len(results)
+
+
+
+def _add_old(memory, session_id, content, days):
+    timestamp = int((time.time() - days * 86400) * 1_000_000)
+    return memory._enqueue(session_id, [(1, content, None, None, 0, timestamp)]).result()
+
+
+def test_compact_session_folds_old_messages_into_summary(tmp_path):
+    memory = ConversationMemory(db_path=str(tmp_path / "compact.db"))
+    for i in range(10):
+        memory.add_message("s1", "user" if i % 2 == 0 else "assistant", f"m{i}")
+    
+    folded = []
+    def summarize(messages):
+        folded.extend(message["content"] for message in messages)
+        return "summary of m0-m5"
+    
+    assert memory.compact_session("s1", keep_last=4, summarizer=summarize) == 6
+    assert folded == [f"m{i}" for i in range(6)]
+    
+    history = memory.get_conversation_history("s1")
+    assert [m["content"] for m in history] == ["summary of m0-m5", "m6", "m7", "m8", "m9"]
+    
+    context = memory.format_for_llm("s1", limit=10)
+    assert context[0]["role"] == "system"
+    assert "summary of m0-m5" in context[0]["content"]
+    
+    # Nothing new to fold in
+    assert memory.compact_session("s1", keep_last=4, summarizer=summarize) == 0
+
+
+def test_purge_expired_deletes_only_old_messages(tmp_path):
+    db_path = str(tmp_path / "purge.db")
+    memory = ConversationMemory(db_path=db_path)
+    _add_old(memory, "s1", "ancient", days=400)
+    _add_old(memory, "s2", "ancient too", days=200)
+    memory.add_message("s1", "user", "recent")
+    _add_old(memory, "s2", "last month", days=30)
+    
+    # Opening the database again is not a purge
+    ConversationMemory(db_path=db_path)
+    assert len(memory.get_conversation_history("s1")) == 2
+    
+    assert memory.purge_expired("s1") == 1
+    assert [m["content"] for m in memory.get_conversation_history("s1")] == ["recent"]
+    assert len(memory.get_conversation_history("s2")) == 2
+    
+    assert memory.purge_expired() == 1
+    assert [m["content"] for m in memory.get_conversation_history("s2")] == ["last month"]
+
+
+def test_purge_all_sessions_uses_index(tmp_path):
+    memory = ConversationMemory(db_path=str(tmp_path / "plan.db"))
+    plan = memory._conn.execute('EXPLAIN QUERY PLAN ' + memory._SQL_PURGE_ALL, (0,)).fetchall()
+    details = " ".join(row[-1] for row in plan)
+    assert "idx_session_ts" in details
+    assert "SCAN conversations" not in details
+
+
+def test_purge_if_due_is_throttled(tmp_path):
+    memory = ConversationMemory(db_path=str(tmp_path / "throttle.db"))
+    memory.add_message("s1", "user", "recent")
+    
+    _add_old(memory, "s1", "first", days=400)
+    memory._purge_if_due()
+    _add_old(memory, "s1", "second", days=400)
+    memory._purge_if_due()
+    
+    assert [m["content"] for m in memory.get_conversation_history("s1")] == ["second", "recent"]
+
+
+def test_failed_bulk_write_is_logged_and_isolated(tmp_path, caplog):
+    memory = ConversationMemory(db_path=str(tmp_path / "bad.db"))
+    
+    # Hold the connection lock so all three entries commit in one batch
+    with caplog.at_level(logging.ERROR, logger="agentforge.memory"):
+        with memory._lock:
+            memory.add_messages_bulk("a", [("user", "first", None, 0)])
+            memory.add_messages_bulk("b", [("user", None, None, 0)])
+            memory.add_messages_bulk("c", [("user", "second", None, 0)])
+        memory.flush()
+    
+    assert [m["content"] for m in memory.get_conversation_history("a")] == ["first"]
+    assert memory.get_conversation_history("b") == []
+    assert [m["content"] for m in memory.get_conversation_history("c")] == ["second"]
+    assert [record.getMessage() for record in caplog.records] == [
+        "Failed to store 1 message(s) for session b"
+    ]
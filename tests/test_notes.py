@@ -0,0 +1,62 @@
+import sqlite3
+
+import pytest
+
+from agentforge.tools import ToolExecutor
+
+
+NOTES = [
+    ("Shopping", "eggs, milk and bread", "home"),
+    ("Reading list", "The C++ Programming Language", "books"),
+    ("Dinner", "try cooking curry", None),
+    ('Quote "of the day"', "stay hungry", "misc"),
+]
+
+
+@pytest.fixture(params=["fts", "like"])
+def executor(request, tmp_path):
+    executor = ToolExecutor(str(tmp_path / "notes.db"))
+    if request.param == "fts":
+        assert executor._fts
+    else:
+        executor._fts = False
+    executor.save_notes_bulk(NOTES)
+    return executor
+
+
+def _titles(result):
+    return sorted(title for title, _, _ in NOTES if f"**{title}**" in result)
+
+
+@pytest.mark.parametrize("term, titles", [
+    ("ping", ["Shopping"]),
+    ("C++", ["Reading list"]),
+    ("MILK", ["Shopping"]),
+    ("milk and", ["Shopping"]),
+    ("ur", ["Dinner"]),
+    ('"of', ['Quote "of the day"']),
+    ("books", ["Reading list"]),
+    ("missing", []),
+])
+def test_search_matches_substrings_on_both_paths(executor, term, titles):
+    assert _titles(executor.get_notes(term)) == titles
+
+
+def test_word_tokenized_index_is_rebuilt(tmp_path):
+    db_path = str(tmp_path / "old.db")
+    ToolExecutor(db_path).save_notes_bulk(NOTES[:1])
+    
+    # Recreate the index the way it was built before the trigram tokenizer
+    conn = sqlite3.connect(db_path)
+    conn.executescript('''
+        DROP TABLE notes_fts;
+        CREATE VIRTUAL TABLE notes_fts 
+        USING fts5(title, content, tags, content='notes', content_rowid='id');
+        INSERT INTO notes_fts (notes_fts) VALUES ('rebuild');
+    ''')
+    conn.close()
+    
+    executor = ToolExecutor(db_path)
+    executor.save_notes_bulk(NOTES[1:2])
+    assert _titles(executor.get_notes("ping")) == ["Shopping"]
+    assert _titles(executor.get_notes("++ Prog")) == ["Reading list"]
@@ -0,0 +1,47 @@
+import threading
+
+from agentforge.storage import BatchWriter, connect
+from agentforge.tools import ToolExecutor
+
+
+def _writer(tmp_path):
+    conn = connect(str(tmp_path / "nested" / "storage.db"))
+    conn.execute('CREATE TABLE items (id INTEGER PRIMARY KEY, name TEXT NOT NULL)')
+    lock = threading.Lock()
+    writer = BatchWriter(conn, lock, 'INSERT INTO items (name) VALUES (?)', name="test-writer")
+    return writer, conn, lock
+
+
+def test_batch_writer_resolves_ids_per_entry(tmp_path):
+    writer, conn, lock = _writer(tmp_path)
+    
+    with lock:
+        futures = [writer.submit([(f"{i}-{j}",) for j in range(i + 1)]) for i in range(4)]
+    
+    ids = [future.result() for future in futures]
+    rows = dict(conn.execute('SELECT id, name FROM items'))
+    assert [[rows[row_id] for row_id in entry] for entry in ids] == [
+        [f"{i}-{j}" for j in range(i + 1)] for i in range(4)
+    ]
+
+
+def test_batch_writer_survives_unexpected_errors(tmp_path):
+    writer, conn, lock = _writer(tmp_path)
+    
+    # Resolving a cancelled future raises inside the writer thread
+    with lock:
+        cancelled = writer.submit([("dropped",)])
+        cancelled.cancel()
+    writer.flush()
+    
+    assert writer.submit([("kept",)]).result(timeout=5) == [2]
+
+
+def test_save_notes_bulk_returns_note_ids(tmp_path):
+    executor = ToolExecutor(str(tmp_path / "notes.db"))
+    
+    ids = executor.save_notes_bulk([("a", "first", None), ("b", "second", "x")])
+    assert executor.save_notes_bulk([("c", "third", None)]) == [ids[-1] + 1]
+    
+    rows = dict(executor._conn.execute('SELECT id, content FROM notes'))
+    assert [rows[note_id] for note_id in ids] == ["first", "second"]
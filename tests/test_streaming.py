@@ -0,0 +1,63 @@
+import queue
+
+from agentforge.streaming import STREAM_DONE, batch_tokens, drain_agent
+
+
+def _tokens(*contents):
+    return [{"type": "token", "content": content} for content in contents]
+
+
+def test_batch_tokens_grows_and_flushes():
+    events = _tokens("0", "1", "2", "3", "4", "5")
+    events.append({"type": "tool_call", "content": {"name": "calculator"}})
+    events += _tokens("x", "y")
+    
+    assert list(batch_tokens(events)) == [
+        {"type": "token", "content": "0"},
+        {"type": "token", "content": "123"},
+        {"type": "token", "content": "45"},
+        {"type": "tool_call", "content": {"name": "calculator"}},
+        {"type": "token", "content": "x"},
+        {"type": "token", "content": "y"},
+    ]
+
+
+def test_batch_tokens_caps_batch_size():
+    batched = list(batch_tokens(_tokens(*"abcdefghij"), factor=2, cap=3))
+    assert [event["content"] for event in batched] == ["a", "bc", "def", "ghi", "j"]
+
+
+class _FakeAgent:
+    def __init__(self, events, error=None):
+        self.events = events
+        self.error = error
+    
+    def chat(self, prompt):
+        yield from self.events
+        if self.error:
+            raise self.error
+
+
+def _drain(agent):
+    steps = queue.Queue()
+    drain_agent(agent, "hi", steps)
+    return [steps.get_nowait() for _ in range(steps.qsize())]
+
+
+def test_drain_agent_forwards_batched_steps_then_done():
+    response = {"type": "response", "content": "ab"}
+    steps = _drain(_FakeAgent(_tokens("a", "b") + [response]))
+    
+    assert steps == [
+        {"type": "token", "content": "a"},
+        {"type": "token", "content": "b"},
+        response,
+        STREAM_DONE,
+    ]
+
+
+def test_drain_agent_forwards_errors():
+    error = RuntimeError("boom")
+    steps = _drain(_FakeAgent(_tokens("a"), error=error))
+    
+    assert steps == [{"type": "token", "content": "a"}, error, STREAM_DONE]
@@ -0,0 +1,60 @@
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from agentforge import cache, tools
+from agentforge.cache import LRUCache, SemanticCache
+from agentforge.tools import ToolExecutor
+
+
+class _FakeEmbedder:
+    """Maps every text to the same vector, recording whether the cache lock was held"""
+    
+    def __init__(self):
+        self.locked_calls = 0
+    
+    def embed(self, texts):
+        if tools._SEARCH_CACHE_LOCK.locked():
+            self.locked_calls += 1
+        return [np.ones(8, dtype=np.float32) for _ in texts]
+
+
+class _FakeDDGS:
+    searches = 0
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, *exc_info):
+        return False
+    
+    def text(self, query, max_results):
+        _FakeDDGS.searches += 1
+        return [{"title": query, "href": "https://example.com", "body": "result"}]
+
+
+@pytest.fixture
+def embedder():
+    return _FakeEmbedder()
+
+
+@pytest.fixture
+def executor(tmp_path, monkeypatch, embedder):
+    semantic = SemanticCache()
+    semantic.enabled = True
+    monkeypatch.setattr(cache, "_get_embedder", lambda model_name: embedder)
+    monkeypatch.setattr(tools, "_SEARCH_SEMANTIC_CACHE", semantic)
+    monkeypatch.setattr(tools, "_SEARCH_EXACT_CACHE", LRUCache())
+    monkeypatch.setattr(tools, "DDGS", _FakeDDGS)
+    _FakeDDGS.searches = 0
+    
+    return ToolExecutor(str(tmp_path / "tools.db"))
+
+
+def test_web_search_embeds_outside_cache_lock(executor, embedder):
+    first = executor.web_search("python asyncio")
+    
+    # A different query with the same meaning is served by the semantic tier
+    assert executor.web_search("Python  asyncio tutorial") == first
+    assert _FakeDDGS.searches == 1
+    assert embedder.locked_calls == 0